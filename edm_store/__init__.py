@@ -9,16 +9,7 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
-from edm_store.config import init_config
-from edm_store.dataset import Dataset, open_dataset
-from edm_store.dm import (unlink,
-                          exist,
-                          get_metadata,
-                          create_image,
-                          create_band,
-                          query_by_filter,
-                          load_dataset_from_file,
-                          PixelAreaBand)
+import importlib
 
 __all__ = [
     "unlink",
@@ -26,6 +17,7 @@ __all__ = [
     "get_metadata",
     "create_image",
     "create_band",
+    "create_bands",
     "query_by_filter",
     "load_dataset_from_file",
     "PixelAreaBand",
@@ -33,3 +25,30 @@ __all__ = [
     "init_config",
     "open_dataset"
 ]
+
+# PEP 562 lazy imports: the heavy raster/mongo stack is only imported
+# on first attribute access, keeping `import edm_store` cheap for
+# callers that just need the config entry points.
+_LAZY_IMPORTS = {
+    "init_config": "edm_store.config",
+    "Dataset": "edm_store.dataset",
+    "open_dataset": "edm_store.dataset",
+    "unlink": "edm_store.dm",
+    "exist": "edm_store.dm",
+    "get_metadata": "edm_store.dm",
+    "create_image": "edm_store.dm",
+    "create_band": "edm_store.dm",
+    "create_bands": "edm_store.dm",
+    "query_by_filter": "edm_store.dm",
+    "load_dataset_from_file": "edm_store.dm",
+    "PixelAreaBand": "edm_store.dm",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
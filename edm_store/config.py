@@ -11,9 +11,14 @@
 
 import json
 import os
-import yaml
 from typing import List, Union
 
+try:
+    # orjson parses JSON several times faster than stdlib json and accepts bytes
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 from edm_store.utils.cache import global_cache
 
 ENVIRONMENT_VARNAME = 'EDM_STORE_CONFIG_PATH'
@@ -23,43 +28,94 @@ DEFAULT_CONF_PATHS = tuple(p for p in ['/etc/edm_store_config.json',
                                        os.environ.get(ENVIRONMENT_VARNAME, ''),
                                        str(os.path.expanduser("~/.edm_store_config.json")),
                                        str(os.path.expanduser("~/.edm_store_config.yaml")),
-                                       'edm_store_config.yaml',
-                                       'edm_store_config.json'] if len(p) > 0)
+                                       'edm_store_config.json',
+                                       'edm_store_config.yaml'] if len(p) > 0)
 
 
-def _load_config(config_path: str):
+# parsed config dicts keyed by (path, st_mtime_ns, st_size), see `_load_config`
+_CONFIG_CACHE = {}
+
+# 依赖当前配置的派生缓存在这里注册失效回调, init_config切换配置后统一
+# 清空; 用回调注册而不是直接import, 避免config反向依赖上层模块
+_CONFIG_INVALIDATION_HOOKS = []
+
+
+def register_config_invalidation_hook(hook):
+    _CONFIG_INVALIDATION_HOOKS.append(hook)
+
+
+def _locate_config_file(config_path: str):
     if config_path is not None:
         config_path_list = [config_path] + list(DEFAULT_CONF_PATHS)
     else:
         config_path_list = list(DEFAULT_CONF_PATHS)
 
+    # probe each candidate directory once via scandir instead of one
+    # stat per candidate path
+    dir_entries = {}
     for config_path in config_path_list:
-        if os.path.exists(config_path):
-            with open(config_path, 'r') as file:
-                ctx = file.read()
-            if config_path.endswith('.json'):
-                return json.loads(ctx)
-            elif config_path.endswith('.yaml'):
-                return yaml.load(ctx, yaml.FullLoader)
-            else:
-                raise TypeError("Invalid config file format")
+        dirname = os.path.dirname(config_path) or '.'
+        entries = dir_entries.get(dirname)
+        if entries is None:
+            try:
+                entries = {e.name for e in os.scandir(dirname)}
+            except OSError:
+                entries = frozenset()
+            dir_entries[dirname] = entries
+        if os.path.basename(config_path) in entries:
+            return config_path
     raise FileNotFoundError("No config file, please specify a valid config file by using function "
                             "`edm_store.init_config({config_path})`.\n"
                             "Although you can configure it in `/etc/edm_store_config.json`, or configure the "
                             "environment variable named `EDM_STORE_CONFIG_PATH`")
 
 
+def _config_file_key(config_path: str):
+    st = os.stat(config_path)
+    return config_path, st.st_mtime_ns, st.st_size
+
+
+def _load_config(config_path: str):
+    config_path = _locate_config_file(config_path)
+
+    key = _config_file_key(config_path)
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    with open(config_path, 'rb') as file:
+        ctx = file.read()
+    if config_path.endswith('.json'):
+        config = _json_loads(ctx)
+    elif config_path.endswith('.yaml'):
+        # PyYAML is only imported when a YAML config is actually used
+        import yaml
+        try:
+            # C-backed loader (libyaml), roughly 10x faster than the
+            # pure-Python one
+            from yaml import CSafeLoader as _YamlLoader
+        except ImportError:
+            from yaml import SafeLoader as _YamlLoader
+        config = yaml.load(ctx, Loader=_YamlLoader)
+    else:
+        raise TypeError("Invalid config file format")
+
+    _CONFIG_CACHE.clear()
+    _CONFIG_CACHE[key] = config
+    return config
+
+
 class LocalConfig:
 
     def __init__(self, config: Union[str, dict] = None):
-        if isinstance(config, str):
+        if isinstance(config, str) or config is None:
             config = _load_config(config)
         if not isinstance(config, dict):
             raise TypeError("Config is not a dictionary or a dict containing config values")
         try:
             self.storage_config = config['storage_client_config']
-            if len(self.storage_config.keys()) > 0:
-                self.base_store_type = list(self.storage_config.keys())[0]
+            if self.storage_config:
+                self.base_store_type = next(iter(self.storage_config))
             else:
                 raise ValueError('At least one storage client in config file is required')
 
@@ -67,28 +123,21 @@ class LocalConfig:
             self.db_config = metadata_config['db_config']
             self.datasource_config = metadata_config['datasource_config']
 
-            if len(self.datasource_config.keys()) > 0:
-                self.base_datasource = list(self.datasource_config.keys())[0]
+            if self.datasource_config:
+                self.base_datasource = next(iter(self.datasource_config))
             else:
                 raise ValueError('At least one datasource in config file is required')
 
             self.max_cache_size = 1024 ** 3
-            if 'cache_config' in metadata_config.keys() and 'max_cache_size' in metadata_config['cache_config']:
+            if 'cache_config' in metadata_config and 'max_cache_size' in metadata_config['cache_config']:
                 self.max_cache_size = int(metadata_config['cache_config']['max_cache_size'])
 
-            self.create_allowed = []
-            self.delete_allowed = []
-            self.datasource_mapper = {}
-
-            for key in self.datasource_config.keys():
-                datasource = self.datasource_config[key]
-
-                if 'create' in datasource['authority']:
-                    self.create_allowed.append(datasource['alias'])
-                if 'delete' in datasource['authority']:
-                    self.delete_allowed.append(datasource['alias'])
-
-                self.datasource_mapper[datasource['alias']] = key
+            datasource_items = list(self.datasource_config.items())
+            self.create_allowed = [ds['alias'] for _, ds in datasource_items
+                                   if 'create' in ds['authority']]
+            self.delete_allowed = [ds['alias'] for _, ds in datasource_items
+                                   if 'delete' in ds['authority']]
+            self.datasource_mapper = {ds['alias']: key for key, ds in datasource_items}
 
         except KeyError as e:
             raise KeyError("Invalid config file, please check the config file") from e
@@ -104,11 +153,25 @@ def auto_config():
     globals()['global_edm_store_config'] = LocalConfig()
 
 
-def init_config(config: Union[str, dict]):
+def init_config(config: Union[str, dict] = None):
+    key = None
+    if isinstance(config, str) or config is None:
+        # skip the cache clear + reconfigure churn when the same file
+        # is re-initialized and has not changed on disk
+        key = _config_file_key(_locate_config_file(config))
+        if key == globals().get('global_edm_store_config_key') \
+                and globals().get('global_edm_store_config') is not None:
+            return
+    # register the key only after construction succeeds, otherwise a
+    # retry with the same broken file would hit the short-circuit above
+    # and silently keep the previous config active
     config = LocalConfig(config)
+    globals()['global_edm_store_config_key'] = key
     globals()['global_edm_store_config'] = config
     global_cache.clear()
     global_cache.configure(config.max_cache_size)
+    for hook in _CONFIG_INVALIDATION_HOOKS:
+        hook()
 
 
 def get_config() -> LocalConfig:
@@ -9,6 +9,7 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import threading
 from typing import Union
 
 from edm_store.dm import PixelAreaBand
@@ -42,11 +43,31 @@ class Dataset:
         return PixelAreaBand(crs=crs, transform=transform, shape=shape, equal_area_projection=equal_area_projection)
 
 
+# per-key locks so concurrent opens of the same dataset share one
+# metadata fetch instead of racing between cache get and set
+_OPEN_LOCKS = {}
+_OPEN_LOCKS_GUARD = threading.Lock()
+
+
+def _open_lock(key) -> threading.Lock:
+    with _OPEN_LOCKS_GUARD:
+        lock = _OPEN_LOCKS.get(key)
+        if lock is None:
+            lock = _OPEN_LOCKS[key] = threading.Lock()
+        return lock
+
+
 def open_dataset(path: str, tile_size: int = None) -> Band:
-    if global_cache.has(str(path)+'_'+str(tile_size)):
-        return global_cache.get(str(path)+'_'+str(tile_size))
-    band_metadata = get_metadata(path)
-    metadata = Metadata(band_metadata)
-    dataset = SlicedBand(metadata, tile_size) if metadata.cropped else UnSlicedBand(metadata, tile_size)
-    global_cache.set(str(path)+'_'+str(tile_size), dataset, 3600)
-    return dataset
+    key = (str(path), tile_size)
+    dataset = global_cache.get(key)
+    if dataset is not None:
+        return dataset
+    with _open_lock(key):
+        dataset = global_cache.get(key)
+        if dataset is not None:
+            return dataset
+        band_metadata = get_metadata(path)
+        metadata = Metadata(band_metadata)
+        dataset = SlicedBand(metadata, tile_size) if metadata.cropped else UnSlicedBand(metadata, tile_size)
+        global_cache.set(key, dataset, 3600)
+        return dataset
@@ -15,6 +15,7 @@ from .meta import \
     get_metadata, \
     create_image, \
     create_band, \
+    create_bands, \
     query_by_filter, \
     load_dataset_from_file, \
     get_image, \
@@ -28,6 +29,7 @@ __all__ = [
     "get_metadata",
     "create_image",
     "create_band",
+    "create_bands",
     "query_by_filter",
     "load_dataset_from_file",
     "get_band",
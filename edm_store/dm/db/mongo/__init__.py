@@ -9,11 +9,14 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+from typing import List, Optional
+
 from edm_store.dm.db.mongo._api_impl import MetadataResourceImpl
 from edm_store.dm.db.mongo._api_interface import MetadataResource
 
 
-def get_metadata_resource_instance(mongoConfig: dict) -> MetadataResource:
+def get_metadata_resource_instance(mongoConfig: dict,
+                                   datasets: Optional[List[str]] = None) -> MetadataResource:
     """
     Get an instance of :class:`MetadataResource`.
 
@@ -30,6 +33,8 @@ def get_metadata_resource_instance(mongoConfig: dict) -> MetadataResource:
     ...     password: str = None
 
     :param mongoConfig: a :class:`dict` for configurations of mongodb
+    :param datasets: dataset names whose image/band path indexes are ensured
+        on the server when the resource is constructed
     :return: an instance of :class:`MetadataResource`
     """
-    return MetadataResourceImpl(mongoConfig)
+    return MetadataResourceImpl(mongoConfig, datasets)
@@ -9,18 +9,29 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
-import json
-from abc import ABC, abstractmethod
-from typing import List, Union, Dict, Optional, Literal
+try:
+    import orjson as json  # noqa: F401 - same loads() surface, much faster
+except ImportError:
+    import json
+import sys
+from abc import ABC
+from functools import lru_cache
+from typing import List, Union, Dict, Iterator, Optional, Literal
 
 from pymongo import MongoClient
 
 from ._mongo_ops import MongoResource, MongoTransaction
-from ._validation import Image, Band
+from ._validation import Image_validator, Band_validator
 
 # ----------------------- Pydantic Validation Models ------------------------ #
 
-_VALIDATE_MODEL_IMAGE, _VALIDATE_MODEL_BAND = Image, Band
+_VALIDATE_MODEL_IMAGE, _VALIDATE_MODEL_BAND = Image_validator, Band_validator
+
+
+@lru_cache(maxsize=256)
+def _collection_name(dataset: str, collection: Literal["image", "band"]) -> str:
+    # interned so repeated collection lookups hash/compare by identity
+    return sys.intern(f"{collection}_{dataset}")
 
 
 # --------------------------------------------------------------------------- #
@@ -33,24 +44,33 @@ class MetadataOpsMixin(ABC):
     A mix-in trait for common operations that a metadata-resource should have.
     (mixin this to get interface `MetadataOpsInterface` implemented automatically)
 
-    Properties that provided for this trait:
-        - def underlying(self) -> MongoResource: ...
+    Subclasses must bind the underlying `MongoResource` (or
+    `MongoTransaction`) to `self._underlying` at construction; ops read
+    the plain attribute directly instead of going through a property
+    descriptor on every call.
     """
 
-    # ------------------------- Abstract Properties  ------------------------ #
-
-    @property
-    @abstractmethod
-    def underlying(self) -> MongoResource:
-        """The underlying `MongoResource` instance."""
-        ...
+    __slots__ = ()
 
     # ----------------------- Default Implementations  ---------------------- #
 
-    def addImage(self, image_metadata: dict, dataset: str = "default") -> bool:
+    def addImage(
+        self, image_metadata: dict, dataset: str = "default", trusted: bool = False
+    ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "image")
-        return self.underlying.insert(
-            collection_name, image_metadata, _VALIDATE_MODEL_IMAGE
+        return self._underlying.insert(
+            collection_name, image_metadata, _VALIDATE_MODEL_IMAGE, trusted
+        )
+
+    def addImages(
+        self,
+        image_metadatas: List[dict],
+        dataset: str = "default",
+        trusted: bool = False,
+    ) -> bool:
+        collection_name = self.__makeCollectionName(dataset, "image")
+        return self._underlying.insert_many(
+            collection_name, image_metadatas, _VALIDATE_MODEL_IMAGE, trusted
         )
 
     def updateImage(
@@ -58,10 +78,14 @@ class MetadataOpsMixin(ABC):
     ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "image")
         query = {"image_path": image_metadata["image_path"]}
-        return self.underlying.update(
+        if "objectId" in image_metadata:
+            # documents fetched via find/getImage carry the renamed _id;
+            # it must not be $set back into the stored document
+            image_metadata = {k: v for k, v in image_metadata.items() if k != "objectId"}
+        return self._underlying.update(
             collection_name,
             query,
-            {"$set": image_metadata},
+            image_metadata,
             _VALIDATE_MODEL_IMAGE,
             upsert,
         )
@@ -70,10 +94,10 @@ class MetadataOpsMixin(ABC):
         self, image_path: Union[str, List[str]], dataset: str = "default"
     ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "image")
-        if type(image_path) is str:
-            return self.underlying.delete(collection_name, {"image_path": image_path})
-        elif type(image_path) is List[str]:
-            return self.underlying.delete(
+        if isinstance(image_path, str):
+            return self._underlying.delete(collection_name, {"image_path": image_path})
+        elif isinstance(image_path, list):
+            return self._underlying.delete(
                 collection_name, {"image_path": {"$in": image_path}}
             )
         else:
@@ -88,33 +112,57 @@ class MetadataOpsMixin(ABC):
         limit: int = 2000,
     ) -> Dict[str, Union[int, List[dict]]]:
         collection_name = self.__makeCollectionName(dataset, "image")
-        if type(filter_json) is str:
-            loaded_json = json.loads(filter_json)
-            retrieved = self.underlying.find(
-                collection_name, loaded_json, limit, return_props
-            )
-            retrieved = list(retrieved)
-            return {"Count": len(retrieved), "Images": retrieved}
-        elif type(filter_json) is dict:
-            retrieved = self.underlying.find(
-                collection_name, filter_json, limit, return_props
-            )
-            retrieved = list(retrieved)
-            return {"Count": len(retrieved), "Images": retrieved}
-        else:
+        if isinstance(filter_json, (str, bytes, bytearray)):
+            filter_json = json.loads(filter_json)
+        elif not isinstance(filter_json, dict):
             msg = "argument 'filter_json' in findImage() must be a `str` or `list`, but {} received."
             raise TypeError(msg.format(type(filter_json)))
+        retrieved = list(
+            self._underlying.find(collection_name, filter_json, limit, return_props)
+        )
+        return {"Count": len(retrieved), "Images": retrieved}
+
+    def iterFindImage(
+        self,
+        filter_json: Union[str, dict],
+        return_props: List[str],
+        dataset: str = "default",
+        limit: int = 2000,
+    ) -> Iterator[dict]:
+        """Streaming variant of :meth:`findImage` yielding documents one by one."""
+        collection_name = self.__makeCollectionName(dataset, "image")
+        if isinstance(filter_json, (str, bytes, bytearray)):
+            filter_json = json.loads(filter_json)
+        elif not isinstance(filter_json, dict):
+            msg = "argument 'filter_json' in iterFindImage() must be a `str` or `list`, but {} received."
+            raise TypeError(msg.format(type(filter_json)))
+        return self._underlying.find_iter(
+            collection_name, filter_json, limit, return_props
+        )
 
     def getImage(self, image_path: str, dataset: str = "default") -> Optional[dict]:
         collection_name = self.__makeCollectionName(dataset, "image")
-        retrieved = self.underlying.find(collection_name, {"image_path": image_path})
+        retrieved = self._underlying.find(collection_name, {"image_path": image_path})
         retrieved = list(retrieved)
         return None if len(retrieved) == 0 else retrieved[0]
 
-    def addBand(self, band_metadata: dict, dataset: str = "default") -> bool:
+    def addBand(
+        self, band_metadata: dict, dataset: str = "default", trusted: bool = False
+    ) -> bool:
+        collection_name = self.__makeCollectionName(dataset, "band")
+        return self._underlying.insert(
+            collection_name, band_metadata, _VALIDATE_MODEL_BAND, trusted
+        )
+
+    def addBands(
+        self,
+        band_metadatas: List[dict],
+        dataset: str = "default",
+        trusted: bool = False,
+    ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "band")
-        return self.underlying.insert(
-            collection_name, band_metadata, _VALIDATE_MODEL_BAND
+        return self._underlying.insert_many(
+            collection_name, band_metadatas, _VALIDATE_MODEL_BAND, trusted
         )
 
     def updateBand(
@@ -122,10 +170,12 @@ class MetadataOpsMixin(ABC):
     ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "band")
         query = {"band_path": band_metadata["band_path"]}
-        return self.underlying.update(
+        if "objectId" in band_metadata:
+            band_metadata = {k: v for k, v in band_metadata.items() if k != "objectId"}
+        return self._underlying.update(
             collection_name,
             query,
-            {"$set": band_metadata},
+            band_metadata,
             _VALIDATE_MODEL_BAND,
             upsert,
         )
@@ -134,10 +184,10 @@ class MetadataOpsMixin(ABC):
         self, band_path: Union[str, List[str]], dataset: str = "default"
     ) -> bool:
         collection_name = self.__makeCollectionName(dataset, "band")
-        if type(band_path) is str:
-            return self.underlying.delete(collection_name, {"band_path": band_path})
-        elif type(band_path) is List[str]:
-            return self.underlying.delete(
+        if isinstance(band_path, str):
+            return self._underlying.delete(collection_name, {"band_path": band_path})
+        elif isinstance(band_path, list):
+            return self._underlying.delete(
                 collection_name, {"band_path": {"$in": band_path}}
             )
         else:
@@ -146,15 +196,22 @@ class MetadataOpsMixin(ABC):
 
     def getBand(self, band_path: str, dataset: str = "default") -> Optional[dict]:
         collection_name = self.__makeCollectionName(dataset, "band")
-        retrieved = self.underlying.find(collection_name, {"band_path": band_path})
+        retrieved = self._underlying.find(collection_name, {"band_path": band_path})
         retrieved = list(retrieved)
         return None if len(retrieved) == 0 else retrieved[0]
 
+    def getBands(self, band_paths: List[str], dataset: str = "default") -> List[dict]:
+        """Fetch all band documents matching `band_paths` with one `$in` query."""
+        collection_name = self.__makeCollectionName(dataset, "band")
+        return list(
+            self._underlying.find(collection_name, {"band_path": {"$in": band_paths}})
+        )
+
     # -------------------------- Private Functions -------------------------- #
 
     @staticmethod
     def __makeCollectionName(dataset: str, collection: Literal["image", "band"]) -> str:
-        return f"{collection}_{dataset}"
+        return _collection_name(dataset, collection)
 
 
 # --------------------------------------------------------------------------- #
@@ -163,40 +220,38 @@ class MetadataOpsMixin(ABC):
 
 
 class MetadataTransactionImpl(MetadataOpsMixin):
-    __slots__ = "__trans"
+    __slots__ = ("_underlying",)
 
     def __init__(self, client: MongoClient, db_name: str) -> None:
-        self.__trans = MongoTransaction(client, db_name)
+        self._underlying = MongoTransaction(client, db_name)
 
     def __enter__(self):
-        self.__trans.__enter__()
+        self._underlying.__enter__()
         return self
 
     def __exit__(self, exc_type, exc_value, exc_traceback) -> bool:
         # delegate to underlying transaction to handle resource releasing.
-        return self.__trans.__exit__(exc_type, exc_value, exc_traceback)
-
-    # ------------------ Properties for `MetadataOpsMixin`  ----------------- #
+        return self._underlying.__exit__(exc_type, exc_value, exc_traceback)
 
     @property
     def underlying(self) -> MongoTransaction:
-        return self.__trans
+        return self._underlying
 
 
 class MetadataResourceImpl(MetadataOpsMixin):
-    __slots__ = "__mongoResource"
+    __slots__ = ("_underlying",)
 
-    def __init__(self, mongo_config: dict) -> None:
-        self.__mongoResource = MongoResource(mongo_config)
+    def __init__(self, mongo_config: dict, datasets: Optional[List[str]] = None) -> None:
+        self._underlying = MongoResource(mongo_config)
+        if datasets:
+            self._underlying.ensure_path_indexes(datasets)
 
     def __del__(self) -> None:
         self.close()
 
-    # ------------------ Properties for `MetadataOpsMixin`  ----------------- #
-
     @property
     def underlying(self) -> MongoResource:
-        return self.__mongoResource
+        return self._underlying
 
     # ---------------------------- Other Methods ---------------------------- #
 
@@ -214,12 +269,12 @@ class MetadataResourceImpl(MetadataOpsMixin):
 
         :return: an instance of :class:`MetadataTransaction`
         """
-        client = self.__mongoResource.client
-        db_name = self.__mongoResource.database.name
+        client = self._underlying.client
+        db_name = self._underlying.database.name
         return MetadataTransactionImpl(client, db_name)
 
     def close(self) -> None:
         """
         释放底层维护的所有资源。
         """
-        self.__mongoResource.close()
+        self._underlying.close()
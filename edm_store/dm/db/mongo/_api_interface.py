@@ -17,12 +17,32 @@ class MetadataOpsProtocol(Protocol):
     Metadata操作所需要支持的操作协议。
     """
 
-    def addImage(self, image_metadata: dict, dataset: str = "default") -> bool:
+    def addImage(
+        self, image_metadata: dict, dataset: str = "default", trusted: bool = False
+    ) -> bool:
         """
         添加一条Image元数据, 其字段格式将被校验。
 
         :param image_metadata: 需要添加的Image元数据
         :param dataset: 数据集名称, 默认值为"default"
+        :param trusted: 元数据是否由内部代码构建, 为`True`时跳过字段校验
+
+        :return: 返回一个`bool`, `True`表示成功, `False`表示失败
+        """
+        ...
+
+    def addImages(
+        self,
+        image_metadatas: List[dict],
+        dataset: str = "default",
+        trusted: bool = False,
+    ) -> bool:
+        """
+        批量添加Image元数据, 其字段格式将被逐条校验, 并通过一次批量写入提交。
+
+        :param image_metadatas: 需要添加的Image元数据列表
+        :param dataset: 数据集名称, 默认值为"default"
+        :param trusted: 元数据是否由内部代码构建, 为`True`时跳过字段校验
 
         :return: 返回一个`bool`, `True`表示成功, `False`表示失败
         """
@@ -110,12 +130,32 @@ class MetadataOpsProtocol(Protocol):
         """
         ...
 
-    def addBand(self, band_metadata: dict, dataset: str = "default") -> bool:
+    def addBand(
+        self, band_metadata: dict, dataset: str = "default", trusted: bool = False
+    ) -> bool:
         """
         添加一条Band元数据, 其字段格式将被校验。
 
         :param band_metadata: 需要添加的Band元数据
         :param dataset: 数据集名称, 默认值为"default"
+        :param trusted: 元数据是否由内部代码构建, 为`True`时跳过字段校验
+
+        :return: 返回一个`bool`, `True`表示成功, `False`表示失败
+        """
+        ...
+
+    def addBands(
+        self,
+        band_metadatas: List[dict],
+        dataset: str = "default",
+        trusted: bool = False,
+    ) -> bool:
+        """
+        批量添加Band元数据, 其字段格式将被逐条校验, 并通过一次批量写入提交。
+
+        :param band_metadatas: 需要添加的Band元数据列表
+        :param dataset: 数据集名称, 默认值为"default"
+        :param trusted: 元数据是否由内部代码构建, 为`True`时跳过字段校验
 
         :return: 返回一个`bool`, `True`表示成功, `False`表示失败
         """
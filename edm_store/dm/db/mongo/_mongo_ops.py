@@ -9,12 +9,50 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Type, Iterable, Optional, List
+from typing import Type, Iterable, Iterator, Optional, List, Union
 
 import pymongo
-from pydantic import BaseModel
-from pymongo import MongoClient, database, client_session
+from bson.codec_options import CodecOptions
+from pydantic import BaseModel, TypeAdapter
+from pymongo import IndexModel, MongoClient, database, client_session
+from pymongo.errors import OperationFailure
+
+from ._validation import MsgspecValidator
+
+# index models per collection-name prefix; shipped to the server in a
+# single `createIndexes` command when a collection is first written
+_INDEX_SPECS = {
+    "band": [
+        IndexModel("band_path", unique=True, background=True),
+        IndexModel([("extent", "2dsphere")]),
+    ],
+    "image": [
+        IndexModel("image_path", unique=True, background=True),
+        IndexModel([("wgs_boundary", "2dsphere")]),
+        IndexModel([("date", pymongo.DESCENDING)]),
+        IndexModel([("year", pymongo.DESCENDING)]),
+    ],
+}
+
+# image documents store 'date'/'processing_time' as int/str, so the
+# tz-aware datetime decoding the client applies globally buys nothing
+# there; naive decoding skips the tzinfo allocation per BSON datetime
+_NAIVE_DATETIME_OPTIONS = CodecOptions(tz_aware=False)
+
+# the query planner often ignores the 2dsphere index for polygon /
+# bounding-box filters and falls back to a collection scan; queries
+# filtering on these fields get the matching index hinted explicitly
+_GEO_HINTS = {
+    "wgs_boundary": [("wgs_boundary", "2dsphere")],
+    "extent": [("extent", "2dsphere")],
+}
+
+# compiled TypeAdapter per BaseModel subclass, built on first use so
+# callers passing a bare model class still validate through a single
+# reused pydantic-core handle instead of model_validate dispatch
+_ADAPTERS: dict = {}
 
 
 # --------------------------------------------------------------------------- #
@@ -34,6 +72,65 @@ class _MongoConfig(BaseModel):
     connect: bool = True
     maxPoolSize: int = 16
 
+    @classmethod
+    def from_trusted_dict(cls, config: dict) -> "_MongoConfig":
+        """
+        Build a config from an internally loaded dict without a full
+        pydantic validation walk; only the cheap scalar coercions that
+        `model_validate` used to apply are kept (e.g. string ports from
+        config files).
+        """
+        return cls.model_construct(
+            host=config["host"],
+            port=int(config["port"]),
+            database=str(config.get("database", "edm_store")),
+            tzAware=bool(config.get("tzAware", True)),
+            connect=bool(config.get("connect", True)),
+            maxPoolSize=int(config.get("maxPoolSize", 16)),
+        )
+
+
+# process-wide `MongoClient` pool: one client (TCP pool + SDAM monitor)
+# per distinct connection signature, shared across `MongoResource`s
+_CLIENT_POOL: dict = {}
+_CLIENT_REFS: dict = {}
+_CLIENT_POOL_LOCK = threading.Lock()
+
+
+def _acquire_client(c: _MongoConfig) -> MongoClient:
+    key = (c.host, c.port, c.tzAware, c.connect, c.maxPoolSize)
+    with _CLIENT_POOL_LOCK:
+        client = _CLIENT_POOL.get(key)
+        if client is None:
+            # keyword-only construction: immune to positional-parameter
+            # drift across pymongo versions; document_class=dict is the
+            # driver default and is not passed at all
+            client = MongoClient(
+                host=c.host,
+                port=c.port,
+                tz_aware=c.tzAware,
+                connect=c.connect,
+                maxPoolSize=c.maxPoolSize,
+            )
+            _CLIENT_POOL[key] = client
+            _CLIENT_REFS[key] = 0
+        _CLIENT_REFS[key] += 1
+    return client
+
+
+def _release_client(client: MongoClient) -> None:
+    with _CLIENT_POOL_LOCK:
+        for key, pooled in _CLIENT_POOL.items():
+            if pooled is client:
+                _CLIENT_REFS[key] -= 1
+                if _CLIENT_REFS[key] <= 0:
+                    del _CLIENT_POOL[key]
+                    del _CLIENT_REFS[key]
+                    client.close()
+                return
+    # not pooled (constructed elsewhere), close directly
+    client.close()
+
 
 # --------------------------------------------------------------------------- #
 # --------------------------- MongoDB Operations  --------------------------- #
@@ -74,11 +171,31 @@ class MongoOpsMixin(ABC):
 
     # ----------------------- Default Implementations  ---------------------- #
 
+    def _collection(self, collection_name: str):
+        # collection handles (with their codec options attached) are
+        # cached per resource; image_ collections decode datetimes as
+        # naive since their date fields are stored as int/str anyway
+        try:
+            handles = self._collection_handles
+        except AttributeError:
+            handles = self._collection_handles = {}
+        collection = handles.get(collection_name)
+        if collection is None:
+            if collection_name.partition("_")[0] == "image":
+                collection = self.database.get_collection(
+                    collection_name, codec_options=_NAIVE_DATETIME_OPTIONS
+                )
+            else:
+                collection = self.database[collection_name]
+            handles[collection_name] = collection
+        return collection
+
     def insert(
             self,
             collection_name: str,
             document: dict,
-            validation: Optional[Type[BaseModel]] = None,
+            validation: Union[Type[BaseModel], TypeAdapter, MsgspecValidator, None] = None,
+            trusted: bool = False,
     ) -> bool:
         """
         Insert a document into the collection.
@@ -86,58 +203,118 @@ class MongoOpsMixin(ABC):
         :param collection_name: the name of collection to operate on
         :param document: the document to insert
         :param validation: pydantic model for insert validation, `None` for bypassing
+        :param trusted: skip validation for documents built by internal code paths
         :return: true when insert operation success, otherwise return false
         """
-        document = self.__validateDocument(document, validation)
+        document = self.__validateDocument(document, None if trusted else validation)
 
         if not self.is_collection_exists(collection_name):
             self.creat_index(collection_name)
+            self._known_collections.add(collection_name)
 
-        collection = self.database[collection_name]
+        collection = self._collection(collection_name)
         return collection.insert_one(document, session=self.session).acknowledged
 
+    def insert_many(
+            self,
+            collection_name: str,
+            documents: List[dict],
+            validation: Union[Type[BaseModel], TypeAdapter, MsgspecValidator, None] = None,
+            trusted: bool = False,
+            ordered: bool = False,
+    ) -> bool:
+        """
+        Insert a batch of documents into the collection with one round-trip.
+
+        :param collection_name: the name of collection to operate on
+        :param documents: the documents to insert
+        :param validation: pydantic model for insert validation, `None` for bypassing
+        :param trusted: skip validation for documents built by internal code paths
+        :param ordered: whether the server must insert in order (slower)
+        :return: true when insert operation success, otherwise return false
+        """
+        if trusted:
+            validation = None
+        documents = [self.__validateDocument(d, validation) for d in documents]
+
+        if not self.is_collection_exists(collection_name):
+            self.creat_index(collection_name)
+            self._known_collections.add(collection_name)
+
+        collection = self._collection(collection_name)
+        return collection.insert_many(
+            documents, ordered=ordered, session=self.session
+        ).acknowledged
+
     def is_collection_exists(self, collection_name: str) -> bool:
-        if collection_name in self.database.list_collection_names():
+        # collections known to exist are cached per resource so the
+        # per-insert existence check stops issuing a listCollections
+        # round-trip; on a miss the list is re-fetched once in case
+        # another writer created the collection in the meantime
+        known = getattr(self, "_known_collections", None)
+        if known is None:
+            known = self._known_collections = set(self.database.list_collection_names())
+            return collection_name in known
+        if collection_name in known:
             return True
-        else:
-            return False
+        known.update(self.database.list_collection_names())
+        return collection_name in known
 
     def creat_index(self, collection_name: str):
-        collection = self.database[collection_name]
-        if "band_" in collection_name:
-            # add indexes to the band table
-            collection.create_index("band_path")
-            collection.create_index([("extent", "2dsphere")])
-        if "image_" in collection_name:
-            # add indexes to the image table
-            collection.create_index("image_path")
-            collection.create_index([("wgs_boundary", "2dsphere")])
-            collection.create_index([("date", pymongo.DESCENDING)])
-            collection.create_index([("year", pymongo.DESCENDING)])
+        specs = _INDEX_SPECS.get(collection_name.partition("_")[0])
+        if specs:
+            self.database[collection_name].create_indexes(specs, session=self.session)
 
 
+    def ensure_path_indexes(self, datasets: Iterable[str]) -> None:
+        """
+        Ensure unique b-tree indexes on 'image_path'/'band_path' for the
+        given datasets, so path lookups and updates use an index seek
+        instead of a collection scan.
+
+        Collections from older deployments may already carry a
+        non-unique index under the same default name (or duplicate path
+        values that block a unique build); those conflicts are left as
+        they are, the legacy index still serves the lookups.
+
+        :param datasets: the dataset names whose collections should be indexed
+        """
+        for dataset in datasets:
+            for collection, field in ((f"image_{dataset}", "image_path"),
+                                      (f"band_{dataset}", "band_path")):
+                try:
+                    self.database[collection].create_index(
+                        field, unique=True, background=True
+                    )
+                except OperationFailure:
+                    pass
+
     def update(
         self,
         collection_name: str,
         query_filter: dict,
-        document: dict,
-        validation: Optional[Type[BaseModel]] = None,
+        update_fields: dict,
+        validation: Union[Type[BaseModel], TypeAdapter, MsgspecValidator, None] = None,
         upsert: bool = False,
+        trusted: bool = False,
     ) -> bool:
         """
         Update documents that satisfies the 'query_filter'.
 
         :param collection_name: the name of collection to operate on
         :param query_filter: the query filter for selecting documents to update
-        :param document: the target document for update
+        :param update_fields: the fields to set on the matched document
         :param validation: pydantic model for insert validation, `None` for bypassing
         :param upsert: whether to insert if no documents match the query filter
+        :param trusted: skip validation for documents built by internal code paths
         :return: true when update operation success, otherwise return false
         """
-        document = self.__validateDocument(document["$set"], validation)
-        collection = self.database[collection_name]
+        update_fields = self.__validateDocument(
+            update_fields, None if trusted else validation
+        )
+        collection = self._collection(collection_name)
         return collection.update_one(
-            query_filter, {"$set": document}, upsert, session=self.session
+            query_filter, {"$set": update_fields}, upsert, session=self.session
         ).acknowledged
 
     def delete(self, collection_name: str, query_filter: dict) -> bool:
@@ -148,7 +325,7 @@ class MongoOpsMixin(ABC):
         :param query_filter: the query filter for selecting documents to delete
         :return: true when delete operation success, otherwise return false
         """
-        collection = self.database[collection_name]
+        collection = self._collection(collection_name)
         return collection.delete_many(query_filter, session=self.session).acknowledged
 
     def find(
@@ -157,45 +334,122 @@ class MongoOpsMixin(ABC):
         query_filter: dict,
         limit: int = 0,
         projection: Optional[List[str]] = None,
-    ) -> Iterable[dict]:
+        batch_size: int = 500,
+        hint: Optional[List[tuple]] = None,
+    ) -> Iterator[dict]:
         """
         Find multiple documents that satisfies the 'query_filter'.
 
+        Documents are yielded lazily as the cursor batches arrive, so
+        consumers can start work while later `getMore`s are in flight;
+        wrap in `list(...)` when the full result set is needed.
+
         :param collection_name: the name of collection to operate on
         :param query_filter: the query filter for selecting documents
         :param limit: the maximum number of results to return (0 means no limit)
         :param projection: a group of fields to retain in the query result, `None` for retaining all.
-        :return: a `Iterable` of `dict` as selected documents
+        :param batch_size: the number of documents fetched per cursor batch
+        :param hint: index specification forced on the query planner; `None`
+            picks the matching 2dsphere index automatically for geospatial filters
+        :return: an `Iterator` of `dict` as selected documents
         """
-        collection = self.database[collection_name]
-        projection = (
-            None
-            if projection is None
-            else ["_id" if x == "objectId" else x for x in projection]
+        return self.find_iter(
+            collection_name, query_filter, limit, projection, batch_size, hint
         )
 
-        result_iterable = collection.find(
-            filter=query_filter,
-            projection=projection,
-            limit=limit,
-            session=self.session,
-        )
+    def find_iter(
+        self,
+        collection_name: str,
+        query_filter: dict,
+        limit: int = 0,
+        projection: Optional[List[str]] = None,
+        batch_size: int = 200,
+        hint: Optional[List[tuple]] = None,
+    ) -> Iterator[dict]:
+        """
+        Like :meth:`find`, but yield documents straight from the cursor
+        instead of materializing the whole result set.
 
-        return [self.__replaceIdKeyName(x) for x in result_iterable]
+        :param collection_name: the name of collection to operate on
+        :param query_filter: the query filter for selecting documents
+        :param limit: the maximum number of results to return (0 means no limit)
+        :param projection: a group of fields to retain in the query result, `None` for retaining all.
+        :param batch_size: the number of documents fetched per cursor batch
+        :param hint: index specification forced on the query planner; `None`
+            picks the matching 2dsphere index automatically for geospatial filters
+        :return: a generator of `dict` as selected documents
+        """
+        collection = self._collection(collection_name)
+        projection = self.__buildProjection(projection)
+
+        auto_hint = False
+        if hint is None:
+            for field in query_filter:
+                geo_hint = _GEO_HINTS.get(field)
+                if geo_hint is not None:
+                    hint = geo_hint
+                    auto_hint = True
+                    break
+
+        def build_cursor(index_hint):
+            cursor = collection.find(
+                filter=query_filter,
+                projection=projection,
+                limit=limit,
+                session=self.session,
+            ).batch_size(batch_size)
+            if index_hint is not None:
+                cursor = cursor.hint(index_hint)
+            return cursor
+
+        cursor = build_cursor(hint)
+        if auto_hint:
+            # hinting a nonexistent index (pre-existing collections may
+            # lack the 2dsphere index) fails the whole query; fall back
+            # to an unhinted find like the planner-chosen baseline
+            try:
+                first = next(cursor)
+            except StopIteration:
+                return
+            except OperationFailure:
+                cursor = build_cursor(None)
+            else:
+                yield self.__replaceIdKeyName(first)
+
+        for document in cursor:
+            yield self.__replaceIdKeyName(document)
 
     # -------------------------- Private Functions -------------------------- #
 
     @staticmethod
     def __validateDocument(
-        raw_document: dict, model: Optional[Type[BaseModel]]
+        raw_document: dict, model: Union[Type[BaseModel], TypeAdapter, MsgspecValidator, None]
     ) -> dict:
         if model is None:
             return raw_document
-        return model.model_validate(raw_document).model_dump()
+        if isinstance(model, MsgspecValidator):
+            return model.validate(raw_document)
+        if not isinstance(model, TypeAdapter):
+            adapter = _ADAPTERS.get(model)
+            if adapter is None:
+                adapter = _ADAPTERS[model] = TypeAdapter(model)
+            model = adapter
+        return model.dump_python(model.validate_python(raw_document))
+
+    @staticmethod
+    def __buildProjection(projection: Optional[List[str]]) -> Optional[dict]:
+        # a projection document lets the server drop unselected fields
+        # before they ever hit the wire; `_id` is excluded unless the
+        # caller asked for it via 'objectId'
+        if projection is None:
+            return None
+        doc = {("_id" if x == "objectId" else x): 1 for x in projection}
+        doc.setdefault("_id", 0)
+        return doc
 
     @staticmethod
     def __replaceIdKeyName(document: dict) -> dict:
-        if "objectId" in document.keys():
+        if "_id" in document:
             document["objectId"] = document.pop("_id")
         return document
 
@@ -301,10 +555,10 @@ class MongoResource(MongoOpsMixin):
         :param config: the `MongoClient` configuration dict
         :return: a `MongoResource` instance
         """
-        c = _MongoConfig.model_validate(config)
-        self.__client = MongoClient(
-            c.host, c.port, dict, c.tzAware, c.connect, maxPoolSize=c.maxPoolSize
-        )
+        # the config dict comes from init_config and is trusted; skip
+        # the pydantic validation walk on every resource construction
+        c = _MongoConfig.from_trusted_dict(config)
+        self.__client = _acquire_client(c)
         self.__database = self.__client[c.database]
 
     # -------------------- Properties for `MongoOpsMixin`  ------------------ #
@@ -335,5 +589,15 @@ class MongoResource(MongoOpsMixin):
         return MongoTransaction(self.__client, self.database.name)
 
     def close(self) -> None:
-        """Close the underlying `pymongo.MongoClient` and release resources."""
-        self.__client.close()
+        """Release the underlying `pymongo.MongoClient` reference.
+
+        The client itself is shared process-wide and is only closed once
+        the last `MongoResource` using it has been closed. Calling this
+        more than once (e.g. an explicit close followed by `__del__` on
+        the owning resource) is a no-op after the first call.
+        """
+        client = self.__client
+        if client is None:
+            return
+        self.__client = None
+        _release_client(client)
@@ -10,7 +10,7 @@
 # See the Mulan PSL v2 for more details.
 
 from typing import Any, List, Union, Dict, Optional
-from pydantic import BaseModel, Extra
+from pydantic import BaseModel, Extra, TypeAdapter
 
 
 # ----------------------------- Pydantic Models ----------------------------- #
@@ -64,3 +64,75 @@ class Image(BaseModel, extra=Extra.allow):
     wgs_boundary: Union[dict, str]
     provider: str
     year: int
+
+
+# ------------------------- Precompiled Validators -------------------------- #
+
+# `TypeAdapter`s are compiled once at import time so per-document validation
+# runs entirely in pydantic-core instead of re-building schemas per call.
+# When `msgspec` is installed its C-level struct validation is used
+# instead, which is faster still on these small documents.
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class MsgspecValidator:
+    """
+    Shape-validate documents against a `msgspec.Struct` type.
+
+    Unlike the pydantic dump round-trip, the original dict is returned
+    unchanged on success so extra fields (e.g. 'extent') survive intact.
+    """
+
+    __slots__ = ("_type",)
+
+    def __init__(self, struct_type) -> None:
+        self._type = struct_type
+
+    def validate(self, document: dict) -> dict:
+        msgspec.convert(document, self._type, strict=False)
+        return document
+
+
+if msgspec is not None:
+
+    # kw_only mirrors dict construction; unknown fields stay tolerated
+    # to keep the pydantic Extra.allow semantics
+    class _BackendStruct(msgspec.Struct, kw_only=True, forbid_unknown_fields=False):
+        path: str
+        type: str
+
+    class _BandStruct(msgspec.Struct, kw_only=True, forbid_unknown_fields=False):
+        band_path: str
+        band_name: str
+        crs: str
+        shape: List[Any]
+        transform: List[Any]
+        image_path: Optional[str]
+        cropped: bool
+        readonly: bool
+        tile_size: int
+        nodata: List[Any]
+        raster_count: int
+        dtypes: List[str]
+        backend: _BackendStruct
+
+    class _ImageStruct(msgspec.Struct, kw_only=True, forbid_unknown_fields=False):
+        image_path: str
+        image_name: str
+        bands: Dict[str, str]
+        date: Union[int, str]
+        processing_time: Union[str, int]
+        wgs_boundary: Union[dict, str]
+        provider: str
+        year: int
+
+    Band_validator = MsgspecValidator(_BandStruct)
+    Image_validator = MsgspecValidator(_ImageStruct)
+
+else:
+    Band_validator = TypeAdapter(Band)
+    Image_validator = TypeAdapter(Image)
@@ -11,6 +11,7 @@
 
 from edm_store.dm.meta._api_impl import \
     create_band,\
+    create_bands,\
     create_image, \
     exist, \
     unlink, \
@@ -9,9 +9,14 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import atexit
+import threading
+from functools import lru_cache
 from typing import Union, Dict, List, Optional
 
-from edm_store.config import get_config
+import numpy as np
+
+from edm_store.config import get_config, register_config_invalidation_hook
 from edm_store.dm.db import get_metadata_resource_instance
 from edm_store.dm.meta._model import BandMetadata, ImageMetadata
 from edm_store.dm.metadata import Metadata
@@ -22,17 +27,65 @@ from edm_store.utils.pixel_type import global_data_type
 from edm_store.utils.tools import verify_and_rebuild_path, rebuilt_path
 
 
+# metadata resources are kept alive per config signature instead of
+# being constructed and torn down (with their connection pools) on
+# every API call; everything is released once at interpreter exit
+_RESOURCE_CACHE: Dict[tuple, object] = {}
+_RESOURCE_LOCK = threading.Lock()
+
+
+def _get_shared_resource(configs: Dict):
+    key = tuple(sorted((k, str(v)) for k, v in configs.items()))
+    with _RESOURCE_LOCK:
+        source = _RESOURCE_CACHE.get(key)
+        if source is None:
+            # 把配置里声明的数据集传下去, 资源构建时一次性补齐路径索引
+            source = _RESOURCE_CACHE[key] = get_metadata_resource_instance(
+                configs, get_config().datasource)
+        return source
+
+
+def _close_shared_resources():
+    with _RESOURCE_LOCK:
+        for source in _RESOURCE_CACHE.values():
+            source.close()
+        _RESOURCE_CACHE.clear()
+
+
+atexit.register(_close_shared_resources)
+
+
+def _tile_paths(fa_dir: str, tiles: List[tuple]) -> List[str]:
+    # 百万级瓦片时逐个f-string拼接是纯Python开销, 用numpy的字符拼接
+    # 在C层一次性构建全部路径
+    if not tiles:
+        return []
+    arr = np.asarray(tiles)
+    prefix = rebuilt_path(fa_dir) + "/"
+    xs = arr[:, 0].astype(str)
+    ys = arr[:, 1].astype(str)
+    paths = np.char.add(np.char.add(prefix, xs), np.char.add(np.char.add("_", ys), ".tif"))
+    return paths.tolist()
+
+
 def get_dataset_source_by_path(dataset_path: str) -> str:
     data_source_type = dataset_path.split('/')[2]
     return _get_dataset_source(data_source_type)
 
 
+@lru_cache(maxsize=None)
 def _get_dataset_source(data_source_type: str) -> str:
-    if data_source_type in get_config().datasource_mapper.keys():
-        return get_config().datasource_mapper[data_source_type]
+    # datasource_mapper 只随配置变化, 查询结果可以缓存;
+    # init_config换配置时通过下面注册的回调清空
+    mapper = get_config().datasource_mapper
+    if data_source_type in mapper:
+        return mapper[data_source_type]
     raise KeyError(f'Unknown dataset source type: {data_source_type}')
 
 
+register_config_invalidation_hook(_get_dataset_source.cache_clear)
+
+
 def find_images(
         filter_json: Union[str, Dict],
         return_props: Optional[List] = None,
@@ -40,12 +93,13 @@ def find_images(
         limit: Optional[int] = 2000,
         configs: Optional[Dict] = None
 ):
-    datasource = get_config().base_datasource if datasource is None else datasource
-    configs = get_config().db_config if configs is None else configs
+    cfg = get_config()
+    datasource = cfg.base_datasource if datasource is None else datasource
+    configs = cfg.db_config if configs is None else configs
 
-    if datasource not in get_config().datasource:
+    if datasource not in cfg.datasource:
         raise ValueError(f'No such datasource named {datasource}')
-    source = get_metadata_resource_instance(configs)
+    source = _get_shared_resource(configs)
     with source.transaction() as db:
         images = db.findImage(filter_json, return_props, datasource, limit)
 
@@ -58,16 +112,13 @@ def get_band(
 ):
     configs = get_config().db_config if configs is None else configs
 
-    source = get_metadata_resource_instance(configs)
-    try:
-        datasource = get_dataset_source_by_path(band_path)
-        with source.transaction() as db:
-            bandMetadata = db.getBand(band_path, datasource)
-            if bandMetadata is None:
-                raise ValueError("No such band or image : {bandPath} ".format(bandPath=band_path))
-        return bandMetadata
-    finally:
-        source.close()
+    source = _get_shared_resource(configs)
+    datasource = get_dataset_source_by_path(band_path)
+    with source.transaction() as db:
+        bandMetadata = db.getBand(band_path, datasource)
+        if bandMetadata is None:
+            raise ValueError("No such band or image : {bandPath} ".format(bandPath=band_path))
+    return bandMetadata
 
 
 def get_image(
@@ -75,16 +126,13 @@ def get_image(
         configs: Optional[Dict] = None
 ):
     configs = get_config().db_config if configs is None else configs
-    source = get_metadata_resource_instance(configs)
-    try:
-        datasource = get_dataset_source_by_path(image_path)
-        with source.transaction() as db:
-            imageMetadata = db.getImage(image_path, datasource)
-            if imageMetadata is None:
-                raise ValueError("No such band or image : {imagePath} ".format(imagePath=image_path))
-        return imageMetadata
-    finally:
-        source.close()
+    source = _get_shared_resource(configs)
+    datasource = get_dataset_source_by_path(image_path)
+    with source.transaction() as db:
+        imageMetadata = db.getImage(image_path, datasource)
+        if imageMetadata is None:
+            raise ValueError("No such band or image : {imagePath} ".format(imagePath=image_path))
+    return imageMetadata
 
 
 def create_image(
@@ -118,17 +166,13 @@ def create_image(
     imageMetadata = ImageMetadata(crs, shape, transform, image_path, bands,
                                   systime=system_time, provider=provider)
 
-    source = get_metadata_resource_instance(configs)
+    source = _get_shared_resource(configs)
     datasource = get_dataset_source_by_path(image_path)
 
-    try:
-
-        with source.transaction() as db:
-            image = db.addImage(imageMetadata.export_to_dict(), datasource)
-        return image
-
-    finally:
-        source.close()
+    with source.transaction() as db:
+        # ImageMetadata 构建出的文档字段齐全, 无需再走一遍模型校验
+        image = db.addImage(imageMetadata.export_to_dict(), datasource, trusted=True)
+    return image
 
 
 def create_band(
@@ -150,25 +194,61 @@ def create_band(
     会真正写入数据。
     同时还有一个需要注意的点是，该方法只能在默认的数据库（default）中创建数据。
     """
-    configs = get_config().db_config if configs is None else configs
+    cfg = get_config()
+    configs = cfg.db_config if configs is None else configs
     band_path = verify_and_rebuild_path(band_path)
 
-    real_path = band_path[:band_path.rindex('.')]
+    real_path = band_path.rpartition('.')[0]
 
-    client = storage_client_mapper.get(get_config().base_store_type)
+    client = storage_client_mapper.get(cfg.base_store_type)
     client.mk_dirs(real_path)
 
     # 构建元数据存储入库
     dataType = global_data_type.get(data_type).rasterio_type
     band_metadata = BandMetadata(crs, shape, transform, band_path, nodata=nodata, rasterCount=1, dataType=dataType,
-                                 imagePath=image_path, realPath=real_path, tileSize=tile_size)
-    source = get_metadata_resource_instance(configs)
-    try:
-        with source.transaction() as db:
-            msg = db.addBand(band_metadata.export_to_dict(), get_config().base_datasource)
-        return msg
-    finally:
-        source.close()
+                                 imagePath=image_path, realPath=real_path, tileSize=tile_size,
+                                 storeType=cfg.base_store_type)
+    source = _get_shared_resource(configs)
+    with source.transaction() as db:
+        # BandMetadata 构建出的文档字段齐全, 无需再走一遍模型校验
+        msg = db.addBand(band_metadata.export_to_dict(), cfg.base_datasource, trusted=True)
+    return msg
+
+
+def create_bands(
+        band_specs: List[Dict],
+        configs: Optional[Dict] = None,
+):
+    """
+    批量创建波段，`band_specs`中的每个元素是一个与`create_band`参数同名的字典，
+    例如 {'crs': ..., 'shape': ..., 'transform': ..., 'band_path': ...,
+    'nodata': ..., 'data_type': ..., 'image_path': ..., 'tile_size': ...}。
+
+    与逐个调用`create_band`相比，所有波段的元数据会在一个事务中通过一次批量写入
+    提交，避免了每个波段一次数据库往返。
+    """
+    cfg = get_config()
+    configs = cfg.db_config if configs is None else configs
+    client = storage_client_mapper.get(cfg.base_store_type)
+
+    documents = []
+    for spec in band_specs:
+        band_path = verify_and_rebuild_path(spec['band_path'])
+        real_path = band_path.rpartition('.')[0]
+        client.mk_dirs(real_path)
+
+        dataType = global_data_type.get(spec['data_type']).rasterio_type
+        band_metadata = BandMetadata(spec['crs'], spec['shape'], spec['transform'], band_path,
+                                     nodata=spec['nodata'], rasterCount=1, dataType=dataType,
+                                     imagePath=spec.get('image_path'), realPath=real_path,
+                                     tileSize=spec.get('tile_size', 2048),
+                                     storeType=cfg.base_store_type)
+        documents.append(band_metadata.export_to_dict())
+
+    source = _get_shared_resource(configs)
+    with source.transaction() as db:
+        msg = db.addBands(documents, cfg.base_datasource, trusted=True)
+    return msg
 
 
 # def create_vrt_dataset(
@@ -216,14 +296,11 @@ def exist_band(
         configs: Optional[Dict] = None
 ):
     configs = get_config().db_config if configs is None else configs
-    source = get_metadata_resource_instance(configs)
-    try:
-        datasource = get_dataset_source_by_path(band_path)
-        with source.transaction() as db:
-            res = db.getBand(band_path, dataset=datasource) is not None
-        return res
-    finally:
-        source.close()
+    source = _get_shared_resource(configs)
+    datasource = get_dataset_source_by_path(band_path)
+    with source.transaction() as db:
+        res = db.getBand(band_path, dataset=datasource) is not None
+    return res
 
 
 def exist_image(
@@ -232,13 +309,10 @@ def exist_image(
 ):
     configs = get_config().db_config if configs is None else configs
     datasource = get_dataset_source_by_path(image_path)
-    source = get_metadata_resource_instance(configs)
-    try:
-        with source.transaction() as db:
-            res = db.getImage(image_path, dataset=datasource) is not None
-        return res
-    finally:
-        source.close()
+    source = _get_shared_resource(configs)
+    with source.transaction() as db:
+        res = db.getImage(image_path, dataset=datasource) is not None
+    return res
 
 
 def unlink_image(
@@ -246,106 +320,90 @@ def unlink_image(
         configs: Optional[Dict] = None,
         concurrency=False
 ):
-    configs = get_config().db_config if configs is None else configs
-    source = get_metadata_resource_instance(configs)
-    try:
-        datasource_type = image_path.split('/')[2]
-
-        if datasource_type not in get_config().delete_allowed:
-            raise ValueError("Illegal deletion")
-
-        with source.transaction() as db:
-            imageMetadata = db.getImage(image_path)
-            if imageMetadata is None:
-                raise ValueError("Can't find band or image named:{imagePath} ".format(imagePath=image_path))
-
-            # 如果Image存在需要删除所有的波段
-            bands: Dict = imageMetadata['bands']
-            for bandKey in bands.keys():
-                bandPath = verify_and_rebuild_path(bands.get(bandKey))
-                bandMetadata = db.getBand(bandPath)
-                if bandMetadata is not None:
-                    # 删除栅格数据
-                    metadata = Metadata(bandMetadata)
-                    client = storage_client_mapper.get(metadata.backend.type)
-                    if metadata.cropped:
-                        # 如果是分块数据
-                        gti = GlobalTileInfo(metadata.transform,
-                                             metadata.shape[1],
-                                             metadata.shape[0],
-                                             metadata.tile_size)
-                        tiles = gti.get_tiles()
-                        faDir = metadata.backend.path
-                        if concurrency:
-                            for tile in tiles:
-                                global_thread_pool_executor.delete_tiles(client, tile[0], tile[1], faDir)
-                        else:
-                            for tile in tiles:
-                                client.delete(rebuilt_path(faDir + "/{}_{}.tif".format(*tile)))
-                    else:
-                        client.delete(metadata.backend.path)
-
-                # 删除Band元数据
-                db.deleteBand(bandPath)
-            return db.deleteImage(image_path)
-    finally:
-        source.close()
-
+    cfg = get_config()
+    configs = cfg.db_config if configs is None else configs
+    source = _get_shared_resource(configs)
+    datasource_type = image_path.split('/')[2]
 
-def unlink_band(
-        band_path: str,
-        configs: Optional[Dict] = None,
-        concurrency=False
-):
-    configs = get_config().db_config if configs is None else configs
-    source = get_metadata_resource_instance(configs)
-    try:
-        datasource_type = band_path.split('/')[2]
-        datasource = get_dataset_source_by_path(band_path)
-        if datasource_type not in get_config().delete_allowed:
-            raise ValueError("Illegal deletion")
-
-        with source.transaction() as db:
-            bandMetadata = db.getBand(band_path, dataset=datasource)
-            if bandMetadata is None:
-                raise ValueError("No such band or image : {bandPath} ".format(bandPath=band_path))
+    if datasource_type not in cfg.delete_allowed:
+        raise ValueError("Illegal deletion")
 
+    with source.transaction() as db:
+        imageMetadata = db.getImage(image_path)
+        if imageMetadata is None:
+            raise ValueError("Can't find band or image named:{imagePath} ".format(imagePath=image_path))
+
+        # 如果Image存在需要删除所有的波段; 单次`$in`查询取回全部波段
+        # 元数据, 栅格数据逐个清理后再一次性删除波段文档
+        bands: Dict = imageMetadata['bands']
+        band_paths = [verify_and_rebuild_path(bandPath) for bandPath in bands.values()]
+        for bandMetadata in db.getBands(band_paths):
             # 删除栅格数据
             metadata = Metadata(bandMetadata)
             client = storage_client_mapper.get(metadata.backend.type)
             if metadata.cropped:
                 # 如果是分块数据
-                gti = GlobalTileInfo(metadata.transform, metadata.shape[1], metadata.shape[0], metadata.tile_size)
+                gti = GlobalTileInfo(metadata.transform,
+                                     metadata.shape[1],
+                                     metadata.shape[0],
+                                     metadata.tile_size)
                 tiles = gti.get_tiles()
                 faDir = metadata.backend.path
-                if concurrency:
-                    for tile in tiles:
-                        global_thread_pool_executor.delete_tiles(client, tile[0], tile[1], faDir)
-                else:
-                    for tile in tiles:
-                        client.delete(faDir + "/{}_{}.tif".format(*tile))
+                # 瓦片删除固定走线程池并发, 串行逐个删除只会在对象存储的
+                # 往返延迟上空等; `concurrency` 参数仅为兼容保留
+                list(global_thread_pool_executor.map(client.delete, _tile_paths(faDir, tiles)))
             else:
-                # 如果不是分块数据
                 client.delete(metadata.backend.path)
 
-            # 删除Image中对应的波段
-            imagePath = bandMetadata['image_path']
-            if imagePath is not None:
-                imageMetadata = db.getImage(imagePath, dataset=datasource)
-                bands: Dict = imageMetadata['bands']
-                newBands = {}
-                for bandKey in bands.keys():
-                    if bands.get(bandKey) == band_path:
-                        continue
-                    newBands[bandKey] = bands.get(bandKey)
-
-                imageMetadata['bands'] = newBands
-                db.updateImage(imageMetadata, dataset=datasource)
-                if len(newBands.keys()) <= 0:
-                    db.deleteImage(imagePath, dataset=datasource)
-            return db.deleteBand(band_path, dataset=datasource)
-    finally:
-        source.close()
+        # 删除Band元数据
+        db.deleteBand(band_paths)
+        return db.deleteImage(image_path)
+
+
+def unlink_band(
+        band_path: str,
+        configs: Optional[Dict] = None,
+        concurrency=False
+):
+    cfg = get_config()
+    configs = cfg.db_config if configs is None else configs
+    source = _get_shared_resource(configs)
+    datasource_type = band_path.split('/')[2]
+    datasource = get_dataset_source_by_path(band_path)
+    if datasource_type not in cfg.delete_allowed:
+        raise ValueError("Illegal deletion")
+
+    with source.transaction() as db:
+        bandMetadata = db.getBand(band_path, dataset=datasource)
+        if bandMetadata is None:
+            raise ValueError("No such band or image : {bandPath} ".format(bandPath=band_path))
+
+        # 删除栅格数据
+        metadata = Metadata(bandMetadata)
+        client = storage_client_mapper.get(metadata.backend.type)
+        if metadata.cropped:
+            # 如果是分块数据
+            gti = GlobalTileInfo(metadata.transform, metadata.shape[1], metadata.shape[0], metadata.tile_size)
+            tiles = gti.get_tiles()
+            faDir = metadata.backend.path
+            # 同 unlink_image, 瓦片删除固定并发执行
+            list(global_thread_pool_executor.map(client.delete, _tile_paths(faDir, tiles)))
+        else:
+            # 如果不是分块数据
+            client.delete(metadata.backend.path)
+
+        # 删除Image中对应的波段
+        imagePath = bandMetadata['image_path']
+        if imagePath is not None:
+            imageMetadata = db.getImage(imagePath, dataset=datasource)
+            bands: Dict = imageMetadata['bands']
+            newBands = {k: v for k, v in bands.items() if v != band_path}
+
+            imageMetadata['bands'] = newBands
+            db.updateImage(imageMetadata, dataset=datasource)
+            if not newBands:
+                db.deleteImage(imagePath, dataset=datasource)
+        return db.deleteBand(band_path, dataset=datasource)
 
 
 def _normal_image_meta(info: dict):
@@ -354,62 +412,80 @@ def _normal_image_meta(info: dict):
     info['dataid'] = info['image_path']
     info.pop('image_name')
     info.pop('image_path')
-    info.pop('_id')
+    # find把'_id'重命名成'objectId'返回, 两个名字都要剥掉, 避免bson
+    # ObjectId泄漏给调用方
+    info.pop('_id', None)
+    info.pop('objectId', None)
+
+
+# aliases introduced by `_normal_image_meta`, mapped back to the stored
+# field names so they can be requested as a server-side projection
+_IMAGE_PROP_ALIASES = {
+    'name': 'image_name',
+    'objectid': 'image_path',
+    'dataid': 'image_path',
+}
 
 
 def query_by_filter(query_json: Union[str, dict],
                     datasource: str,
                     return_prop: list = None,
                     limit: int = 2000):
-    infos = find_images(query_json, datasource=datasource, limit=limit)
+    projection = None
+    if return_prop is not None:
+        # ship only the requested fields over the wire; image_name and
+        # image_path stay included because _normal_image_meta needs them
+        fields = {_IMAGE_PROP_ALIASES.get(prop, prop) for prop in return_prop}
+        fields.update(('image_name', 'image_path'))
+        projection = list(fields)
+
+    infos = find_images(query_json, return_props=projection, datasource=datasource, limit=limit)
     imagesInfo = []
     for info in infos['Images']:
         _normal_image_meta(info)
-        tmp = {}
         if return_prop is not None:
-            for index in return_prop:
-                tmp[index] = info.get(index)
-        else:
-            tmp = info
-        imagesInfo.append(tmp)
-        del tmp
+            info = {index: info.get(index) for index in return_prop}
+        imagesInfo.append(info)
     infos['Images'] = imagesInfo
     return infos
 
 
 def get_metadata(path: str):
-    ext = path[path.rindex('.') + 1:]
+    stem, _, ext = path.rpartition('.')
+    ext = ext.upper()
 
-    if ext.upper() == 'IMAGE':
-        image = get_image(path.replace(ext, 'IMAGE'))
+    if ext == 'IMAGE':
+        image = get_image(stem + '.IMAGE')
         _normal_image_meta(image)
         return image
 
-    if ext.upper() in ['BAND', 'TIF', 'TIFF']:
-        return get_band(path.replace(ext, 'BAND'))
+    if ext in ('BAND', 'TIF', 'TIFF'):
+        return get_band(stem + '.BAND')
 
     raise ValueError('Illegal band path or image path')
 
 
 def exist(path: str):
-    ext = path[path.rindex('.') + 1:]
+    stem, _, ext = path.rpartition('.')
+    ext = ext.upper()
 
-    if ext.upper() == 'IMAGE':
-        return exist_image(path.replace(ext, 'IMAGE'))
+    if ext == 'IMAGE':
+        return exist_image(stem + '.IMAGE')
 
-    if ext.upper() in ['BAND', 'TIF', 'TIFF']:
-        return exist_band(path.replace(ext, 'BAND'))
+    if ext in ('BAND', 'TIF', 'TIFF'):
+        return exist_band(stem + '.BAND')
 
     raise ValueError('Illegal band path or image path')
 
 
 def unlink(path: str, concurrency=False):
-    ext = path[path.rindex('.') + 1:]
+    stem, _, ext = path.rpartition('.')
+    ext = ext.upper()
 
-    if ext.upper() == 'IMAGE':
-        return unlink_image(path.replace(ext, 'IMAGE'), concurrency=concurrency)
+    if ext == 'IMAGE':
+        return unlink_image(stem + '.IMAGE', concurrency=concurrency)
 
-    if ext.upper() in ['BAND', 'TIF', 'TIFF']:
-        return unlink_band(path.replace(ext, 'BAND'), concurrency=concurrency)
+    if ext in ('BAND', 'TIF', 'TIFF'):
+        return unlink_band(stem + '.BAND', concurrency=concurrency)
 
     raise ValueError('Illegal band path or image path')
@@ -9,14 +9,41 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import sys
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Union
 
+import numpy as np
+
 from edm_store.config import get_config
 from edm_store.dm.vector.core import geobox_info
 from edm_store.utils.tools import gen_format_time
 
 
+@lru_cache(maxsize=1024)
+def _backend_mapping(real_path: str, store_type: str) -> MappingProxyType:
+    # 享元: 同一后端描述在多个波段间共享一个只读映射, BSON编码按普通
+    # Mapping处理, 导出文档不受影响
+    return MappingProxyType({'path': real_path, 'type': sys.intern(store_type)})
+
+
 class BandMetadata:
+    # 固定槽位代替字典存储: 属性访问走偏移量而非哈希探测, 大批量构建时
+    # 每个实例还能省下一个元数据字典
+    __slots__ = (
+        'band_path', 'band_name', 'crs', 'shape', 'transform', 'image_path',
+        '_extent', 'tile_size', 'nodata', 'raster_count', 'dtypes', 'backend',
+        'readonly', 'cropped', '_tile_key'
+    )
+
+    # export_to_dict 输出的文档字段, 'extent'经由property惰性计算
+    _EXPORT_FIELDS = (
+        'band_path', 'band_name', 'crs', 'shape', 'transform', 'image_path',
+        'extent', 'tile_size', 'nodata', 'raster_count', 'dtypes', 'backend',
+        'readonly', 'cropped'
+    )
+
     def __init__(
             self,
             crs: str,
@@ -34,45 +61,79 @@ class BandMetadata:
             readonly: bool = False
     ):
 
-        if not isinstance(nodata, list):
-            nodata = [nodata]
-
-        if not isinstance(dataType, list):
-            dataType = [dataType]
-
-        backend = {'path': realPath, 'type': get_config().base_store_type if storeType is None else storeType}
-
-        self.metadata = {
-            'band_path': bandPath,
-            'band_name': bandPath[bandPath.rindex('/') + 1:],
-            'crs': crs,
-            'shape': list(shape),
-            'transform': list(transform),
-            'image_path': imagePath,
-            'extent': geobox_info(transform, shape, s_crs=crs),
-            'tile_size': tileSize,
-            'nodata': nodata,
-            'raster_count': rasterCount,
-            'dtypes': dataType,
-            'backend': backend,
-            'readonly': readonly,
-            'cropped': cropped
-        }
-
-    def __getattr__(self, item):
-        return self.metadata.get(item)
+        # 统一归一化为元组: 标量只包一层, 序列不再复制成新list
+        nodata = (nodata,) if not isinstance(nodata, (list, tuple)) else tuple(nodata)
+        dataType = (dataType,) if not isinstance(dataType, (list, tuple)) else tuple(dataType)
+
+        # 调用方显式传入storeType时完全不触碰全局配置
+        if storeType is None:
+            storeType = get_config().base_store_type
+
+        self.band_path = bandPath
+        self.band_name = bandPath.rpartition('/')[2]
+        # 同一批入库的波段几乎总是共享CRS串, 驻留后比较/哈希走指针路径
+        self.crs = sys.intern(crs) if isinstance(crs, str) else crs
+        self.shape = shape if isinstance(shape, tuple) else tuple(shape)
+        self.transform = transform if isinstance(transform, tuple) else tuple(transform)
+        self.image_path = imagePath
+        self._extent = None
+        self.tile_size = tileSize
+        self.nodata = nodata
+        self.raster_count = rasterCount
+        self.dtypes = dataType
+        self.backend = _backend_mapping(realPath, storeType)
+        self.readonly = readonly
+        self.cropped = cropped
+        # 同一瓦片网格的波段共享 (crs, 瓦片尺寸, 网格原点), 预计算成
+        # 分组键后, 按网格聚合只需一次dict桶查找
+        self._tile_key = (self.crs, tileSize, self.transform[0], self.transform[3])
+
+    @property
+    def extent(self):
+        # 只枚举路径/类型等字段的调用方不必为范围几何买单, 首次访问
+        # 时才计算并缓存
+        value = self._extent
+        if value is None:
+            value = self._extent = geobox_info(self.transform, self.shape, s_crs=self.crs)
+        return value
+
+    @extent.setter
+    def extent(self, value):
+        self._extent = value
 
     def __setitem__(self, key, value):
-        self.metadata[key] = value
+        """兼容旧的下标写法, 新代码请直接使用属性赋值。"""
+        setattr(self, key, value)
 
     def __getitem__(self, item):
-        return self.metadata.get(item)
+        """兼容旧的下标写法, 新代码请直接读属性; 未知字段返回`None`。"""
+        return getattr(self, item, None)
 
     def export_to_dict(self) -> dict:
-        return self.metadata
+        # 必须返回新建的可变dict: pymongo插入时会往文档里写入'_id'
+        return {name: getattr(self, name) for name in self._EXPORT_FIELDS}
+
+    def as_numpy_extent(self) -> np.ndarray:
+        """
+        以 [xmin, ymin, xmax, ymax] 的float64数组返回波段范围, 便于对
+        大量波段做向量化的包围盒运算。
+        """
+        ring = np.asarray(self.extent['coordinates'][0], dtype=np.float64)
+        xs, ys = ring[:, 0], ring[:, 1]
+        return np.array([xs.min(), ys.min(), xs.max(), ys.max()])
 
 
 class ImageMetadata:
+    __slots__ = (
+        'image_path', 'image_name', '_wgs_boundary', 'date', 'year',
+        'provider', 'processing_time', 'bands', '_crs', '_transform', '_shape'
+    )
+
+    _EXPORT_FIELDS = (
+        'image_path', 'image_name', 'wgs_boundary', 'date', 'year',
+        'provider', 'processing_time', 'bands'
+    )
+
     def __init__(
             self,
             crs,
@@ -87,35 +148,110 @@ class ImageMetadata:
 
         self.bands = bands if bands is not None else {}
 
-        systime, year = gen_format_time(systime)
+        # systime为空时 gen_format_time 返回的就是当前时间, 直接复用,
+        # 避免再做一次 datetime.now()+strftime
+        date, year = gen_format_time(systime)
+
+        self.image_path = imagePath
+        self.image_name = imagePath.rpartition('/')[2]
+        self._wgs_boundary = None
+        self._crs = crs
+        self._transform = transform
+        self._shape = shape
+        self.date = date
+        self.year = year
+        self.provider = provider
+        self.processing_time = date if systime is None else gen_format_time()[0]
 
-        self.metadata = {
-            'image_path': imagePath,
-            'image_name': imagePath[imagePath.rindex('/') + 1:],
-            'wgs_boundary': geobox_info(transform, shape, s_crs=crs, t_crs='epsg:4326'),
-            'date': systime,
-            'year': year,
-            'provider': provider,
-            'processing_time': gen_format_time()[0]
-        }
+    @property
+    def wgs_boundary(self):
+        # 与 BandMetadata.extent 同理, 仅在需要时做坐标转换
+        value = self._wgs_boundary
+        if value is None:
+            value = self._wgs_boundary = geobox_info(
+                self._transform, self._shape, s_crs=self._crs, t_crs='epsg:4326'
+            )
+        return value
 
-    def __getattr__(self, item):
-        return self.metadata.get(item)
+    @wgs_boundary.setter
+    def wgs_boundary(self, value):
+        self._wgs_boundary = value
 
     def __setitem__(self, key, value):
-        self.metadata[key] = value
+        """兼容旧的下标写法, 新代码请直接使用属性赋值。"""
+        setattr(self, key, value)
 
     def __getitem__(self, item):
-        return self.metadata.get(item)
+        """兼容旧的下标写法, 新代码请直接读属性; 未知字段返回`None`。"""
+        return getattr(self, item, None)
 
     def export_to_dict(self) -> dict:
-        self.metadata['bands'] = self.bands
-        return self.metadata
+        return {name: getattr(self, name) for name in self._EXPORT_FIELDS}
 
     def add_band_from_name(self, bandName: str, bandPath: str):
         self.bands[bandName] = bandPath
         return self
 
     def add_band_from_BandMetadata(self, bandName: str, band: BandMetadata):
-        self.bands[bandName] = band.bandPath
+        self.bands[bandName] = band.band_path
+        return self
+
+    def add_bands(self, items: dict):
+        """
+        批量登记波段, `items`为 波段名 -> `BandMetadata` 的映射, 一次
+        update完成K个波段的写入, 避免K次方法调用。
+        """
+        self.bands.update({name: band.band_path for name, band in items.items()})
         return self
+
+
+class BandTable:
+    """
+    一组波段元数据的列式(SoA)视图: 数值列以numpy数组存放, 字符串列
+    保持为列表。相比`List[BandMetadata]`, 范围求交这类批量几何判断可
+    以在整表上做一次向量化比较, 而不是逐个对象循环。
+    """
+
+    __slots__ = ('band_paths', 'crs', 'shapes', 'transforms', 'extents', 'nodata', 'dtypes')
+
+    def __init__(self, band_paths, crs, shapes, transforms, extents, nodata, dtypes):
+        self.band_paths = band_paths
+        self.crs = crs
+        self.shapes = shapes
+        self.transforms = transforms
+        self.extents = extents
+        self.nodata = nodata
+        self.dtypes = dtypes
+
+    @classmethod
+    def from_band_metadata(cls, bands) -> 'BandTable':
+        """
+        将若干`BandMetadata`转置为列式表。
+        """
+        bands = list(bands)
+        if not bands:
+            return cls([], [], np.empty((0, 2), dtype=np.int64),
+                       np.empty((0, 6), dtype=np.float64),
+                       np.empty((0, 4), dtype=np.float64), [], [])
+        return cls(
+            band_paths=[b.band_path for b in bands],
+            crs=[b.crs for b in bands],
+            shapes=np.asarray([b.shape for b in bands], dtype=np.int64),
+            transforms=np.asarray([b.transform for b in bands], dtype=np.float64),
+            extents=np.stack([b.as_numpy_extent() for b in bands]),
+            nodata=[b.nodata for b in bands],
+            dtypes=[b.dtypes for b in bands],
+        )
+
+    def __len__(self) -> int:
+        return len(self.band_paths)
+
+    def overlaps(self, bbox) -> np.ndarray:
+        """
+        对整表做一次包围盒相交判断, `bbox`为[xmin, ymin, xmax, ymax],
+        返回布尔掩码。
+        """
+        xmin, ymin, xmax, ymax = bbox
+        extents = self.extents
+        return ((extents[:, 0] <= xmax) & (extents[:, 2] >= xmin)
+                & (extents[:, 1] <= ymax) & (extents[:, 3] >= ymin))
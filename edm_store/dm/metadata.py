@@ -9,18 +9,80 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+from collections import namedtuple
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _record_type(fields: tuple):
+    # namedtuple class creation is expensive (exec-based); documents
+    # sharing a key set reuse one compiled record class
+    return namedtuple('MetadataRecord', fields, rename=True)
+
+
+def freeze(dict_doc: dict):
+    """
+    Build a read-only record from a metadata dict: attribute access is a
+    C-level tuple index instead of a dict probe, which pays off when one
+    document is read many times in a hot loop.
+
+    Nested dicts are frozen recursively. Unlike :class:`Metadata`,
+    missing attributes raise `AttributeError` and the result is
+    immutable; use `Metadata` where writes or absent-field tolerance
+    are needed.
+    """
+    if isinstance(dict_doc, dict):
+        record = _record_type(tuple(dict_doc.keys()))
+        return record(*[freeze(value) for value in dict_doc.values()])
+    return dict_doc
+
+
 class Metadata(object):
     """
     Converting the dict dictionary to an object.
     You can use 'CLASS_NAME.property_name' to get the element
     """
-    def __init__(self, dict_doc=None):
+    __slots__ = ('_metadata_docs', '_children')
+
+    def __init__(self, dict_doc=None, flatten=False):
+        """
+        :param dict_doc: the metadata dict to wrap
+        :param flatten: collapse nested dicts into underscore-joined
+            top-level keys (`meta.backend_path` instead of
+            `meta.backend.path`), trading structure for zero wrapper
+            allocations on hot read paths
+        """
+        if flatten and dict_doc:
+            dict_doc = self._flatten(dict_doc)
         self._metadata_docs = dict_doc
+        self._children = {}
+
+    @staticmethod
+    def _flatten(dict_doc, prefix='', out=None):
+        if out is None:
+            out = {}
+        for key, value in dict_doc.items():
+            if isinstance(value, dict):
+                Metadata._flatten(value, prefix + key + '_', out)
+            else:
+                out[prefix + key] = value
+        return out
 
     def __getattr__(self, name):
+        # dunder/underscore probes (pickling, deepcopy, IPython) must
+        # raise instead of answering None - returning None for
+        # __deepcopy__ made copy.deepcopy call it and crash
+        if name.startswith('_'):
+            raise AttributeError(name)
+        # nested dicts are wrapped once and reused, so loops touching
+        # e.g. `meta.backend.path` don't allocate a wrapper per access
+        children = self._children
+        child = children.get(name)
+        if child is not None:
+            return child
         val = self._metadata_docs.get(name)
         if isinstance(val, dict):
-            return Metadata(val)
+            val = children[name] = Metadata(val)
         return val
 
     def to_dict(self):
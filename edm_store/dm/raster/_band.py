@@ -17,12 +17,10 @@ import numpy as np
 
 from typing import Union, List
 
-import rasterio
 from osgeo import osr
 from affine import Affine
 from rasterio import MemoryFile
-import rasterio.mask
-from concurrent.futures import ThreadPoolExecutor
+from rasterio.features import geometry_mask
 
 from rasterio.enums import Resampling
 
@@ -69,6 +67,10 @@ class Band:
         self.metadata = metadata
         self.crs = osr.SpatialReference()
         self.crs.SetFromUserInput(self.metadata.crs)
+        # 坐标系导出串在热路径上反复使用, OGR每次导出都要进C层并新建
+        # 字符串, 这里一次算好缓存
+        self._proj4 = self.crs.ExportToProj4()
+        self._wkt = self.crs.ExportToWkt()
         self.gti = GlobalTileInfo(self.metadata.transform, self.metadata.shape[1],
                                   self.metadata.shape[0], self.metadata.tile_size)
 
@@ -79,6 +81,38 @@ class Band:
 
         self._datatype = global_data_type.get(self.metadata.dtypes[0])
 
+        # 范围几何在Band生命周期内不变, 首次访问后缓存, 避免循环调用
+        # get_extent时反复解析json并重建OGR几何
+        self._extent_geom = None
+        self._extent_envelope = None
+        self._extent_json = None
+
+        # overview系数整个Band生命周期不变, 预先过滤掉系数1:
+        # factor=1的overview就是原始分辨率数据的一个完整副本
+        self._overview_factors = tuple(f for f in self.gti._factors if f > 1)
+
+        # 写tile时的GTiff profile中只有transform和尺寸逐块变化,
+        # 常量部分只构建一次
+        self._tile_profile_base = {
+            'driver': 'GTiff',
+            'count': 1,
+            'dtype': self.metadata.dtypes[0],
+            'nodata': 0,
+            'crs': self.get_projection_as_proj4(),
+            'compress': 'lzw',
+            # 内部按256x256分块, 远端窗口读取只需抓取命中的块而不是整行
+            'tiled': True,
+            'blockxsize': 256,
+            'blockysize': 256,
+        }
+
+    def _extent_geometry(self):
+        geom = self._extent_geom
+        if geom is None:
+            geom = self._extent_geom = GeometryGenerator(
+                self.metadata.extent.to_dict()).export_to_ogr_geometry()
+        return geom
+
     @property
     def client(self):
         return self._client
@@ -139,26 +173,28 @@ class Band:
         e.g.
             "PROJCS[\"WGS 84 / UTM zone 50N\",GEOGCS[\"WGS 84\",DATUM[\"WGS_1984\"]]"
         """
-        return self.crs.ExportToProj4()
+        return self._proj4
 
     def get_projection_as_proj4(self) -> str:
-        return self.crs.ExportToProj4()
+        return self._proj4
 
     def get_projection_as_wkt(self) -> str:
         """
         获取当前数据的投影坐标系
         :return str 返回当前数据的投影坐标系的wkt的形式
         """
-        return self.crs.ExportToWkt()
+        return self._wkt
 
     def get_extent(self) -> tuple:
         """
         返回当前数据的最大范围（该范围为扩充后的范围）
         :return tuple
         """
-        min_x, max_x, min_y, max_y = (GeometryGenerator(self.metadata.extent.to_dict())
-                                      .export_to_ogr_geometry().GetEnvelope())
-        return min_x, min_y, max_x, max_y
+        envelope = self._extent_envelope
+        if envelope is None:
+            min_x, max_x, min_y, max_y = self._extent_geometry().GetEnvelope()
+            envelope = self._extent_envelope = (min_x, min_y, max_x, max_y)
+        return envelope
 
     def get_extent_as_geojson(self) -> str:
         """
@@ -169,21 +205,20 @@ class Band:
             [[[166035,4290915],[166035,4598115],[473235,4598115],
                                                 [473235,4290915],[166035,4290915]]]}'
         """
-        return (GeometryGenerator(self.metadata.extent.to_dict())
-                .export_to_ogr_geometry().ExportToJson())
+        geojson = self._extent_json
+        if geojson is None:
+            geojson = self._extent_json = self._extent_geometry().ExportToJson()
+        return geojson
 
     def transform_coords(self,
                          cords: [list, tuple]
                          ) -> list:
         _transform = self.metadata.transform
-        total = int(len(cords) / 2)
-        points = []
-        for idx in range(total):
-            x_val = cords[idx * 2]
-            y_val = cords[idx * 2 + 1]
-            points.append(_transform[0] + _transform[1] * x_val)
-            points.append(_transform[3] + _transform[5] * y_val)
-        return points
+        # 仿射映射逐点循环改成一次numpy向量运算, 点数较多时避免逐次解释器开销
+        points = np.asarray(cords, dtype=np.float64).reshape(-1, 2)
+        points *= (_transform[1], _transform[5])
+        points += (_transform[0], _transform[3])
+        return points.ravel().tolist()
 
     def get_size(self) -> tuple:
         return self.metadata.shape
@@ -266,21 +301,81 @@ class Band:
         # y
         sy = int(abs((t_y - start_y) / step_y))
         ey = int(abs(math.ceil((b_y - start_y) / step_y)))
+
+        return self._tiles_in_envelope(t_box, (l_x, r_x, b_y, t_y), sx, ex, sy, ey)
+
+    def query_tiles_batch(self,
+                          cutLines: list,
+                          crs: str
+                          ) -> list:
+        """
+        批量查询多个裁剪范围命中的tile, 所有cutline的索引区间一次算完,
+        返回与输入顺序一一对应的结果列表。
+        """
+        if not cutLines:
+            return []
+
+        boxes = [GeometryGenerator(cutLine).set_crs(crs).transform(
+            self.metadata.crs).export_to_ogr_geometry() for cutLine in cutLines]
+        envs = np.asarray([box.GetEnvelope() for box in boxes], dtype=np.float64)
+
+        _transform = self.metadata.transform
+        start_x = self.gti.firstTileLeftX
+        start_y = self.gti.firstTileLeftY
+        step_x = self.gti.reSize * _transform[1]
+        step_y = self.gti.reSize * _transform[5]
+
+        sxs = np.abs((envs[:, 0] - start_x) / step_x).astype(np.int64)
+        exs = np.abs(np.ceil((envs[:, 1] - start_x) / step_x)).astype(np.int64)
+        sys_ = np.abs((envs[:, 3] - start_y) / step_y).astype(np.int64)
+        eys = np.abs(np.ceil((envs[:, 2] - start_y) / step_y)).astype(np.int64)
+
+        return [self._tiles_in_envelope(box, tuple(env), int(sxs[i]), int(exs[i]),
+                                        int(sys_[i]), int(eys[i]))
+                for i, (box, env) in enumerate(zip(boxes, envs))]
+
+    def _tiles_in_envelope(self, t_box, envelope, sx, ex, sy, ey):
+        l_x, r_x, b_y, t_y = envelope
+
+        _transform = self.metadata.transform
+        start_x = self.gti.firstTileLeftX
+        start_y = self.gti.firstTileLeftY
+        step_x = self.gti.reSize * _transform[1]
+        step_y = self.gti.reSize * _transform[5]
+
+        # 候选tile全部是轴对齐矩形, 先用一次numpy广播完成包围盒求交,
+        # 不再为每个tile构造OGR几何
+        xs = np.arange(sx, ex + 1)
+        ys = np.arange(sy, ey + 1)
+        tile_min_x = start_x + xs * step_x
+        tile_max_x = tile_min_x + step_x
+        tile_max_y = start_y + ys * step_y
+        tile_min_y = tile_max_y + step_y
+        x_hit = (tile_max_x >= l_x) & (tile_min_x <= r_x)
+        y_hit = (tile_max_y >= b_y) & (tile_min_y <= t_y)
+        candidates = [(int(xs[ix]), int(ys[iy]))
+                      for ix, iy in np.argwhere(x_hit[:, None] & y_hit[None, :])]
+
+        # 裁剪范围本身就是矩形时包围盒求交即精确结果; 否则仅对粗筛
+        # 通过的tile做精确的OGR相交判断
+        envelope_area = (r_x - l_x) * (t_y - b_y)
+        if abs(t_box.GetArea() - envelope_area) <= 1e-9 * max(envelope_area, 1.0):
+            return candidates
+
         res = []
-        for x in range(sx, ex + 1):
-            for y in range(sy, ey + 1):
-                min_x = start_x + x * step_x
-                max_x = start_x + (x + 1) * step_x
-                max_y = start_y + y * step_y
-                min_y = start_y + (y + 1) * step_y
-                box = GeometryGenerator({"type": "Polygon",
-                                         "coordinates": [
-                                             [[min_x, max_y], [max_x, max_y], [max_x, min_y], [min_x, min_y],
-                                              [min_x, max_y]]
-                                         ]
-                                         }).export_to_ogr_geometry()
-                if t_box.Intersection(box):
-                    res.append((x, y))
+        for x, y in candidates:
+            min_x = start_x + x * step_x
+            max_x = start_x + (x + 1) * step_x
+            max_y = start_y + y * step_y
+            min_y = start_y + (y + 1) * step_y
+            box = GeometryGenerator({"type": "Polygon",
+                                     "coordinates": [
+                                         [[min_x, max_y], [max_x, max_y], [max_x, min_y], [min_x, min_y],
+                                          [min_x, max_y]]
+                                     ]
+                                     }).export_to_ogr_geometry()
+            if t_box.Intersects(box):
+                res.append((x, y))
         return res
 
     def create_dataset(self,
@@ -322,24 +417,17 @@ class Band:
         data = self.read_tile(x, y)
 
         _transform, shape = self.get_tile_info(x, y)
-        # 创建内存文件将需要读取的部分预先读取到内存中
 
-        with MemoryFile() as mem_file:
-            # 对内存中的文件进行写入
-            with mem_file.open(driver='GTiff', count=1, width=shape[1], height=shape[0],
-                               dtype=self.datatype, nodata=fill_val,
-                               transform=Affine.from_gdal(*_transform), crs=self.metadata.crs) as dataset:
-                dataset.write(data, 1)
-            # 对文件进行掩码
-            with mem_file.open(driver='GTiff') as tmp:
-                out_image, out_transform = rasterio.mask.mask(tmp,
-                                                              [json.loads(t_box)],
-                                                              crop=False,
-                                                              nodata=fill_val)
+        # 数据已经在内存数组里, 直接栅格化几何生成掩膜, 不再经过一次
+        # GTiff的编码/解码往返; mask为True的像素在几何之外, 填fill_val
+        mask = geometry_mask([json.loads(t_box)],
+                             out_shape=(int(shape[0]), int(shape[1])),
+                             transform=Affine.from_gdal(*_transform))
+        out_image = np.where(mask, np.asarray(fill_val, dtype=data.dtype), data)
 
         out_meta = {"search": "GTiff", "height": shape[0], "width": shape[1], "transform": _transform}
 
-        return out_image[0], out_meta
+        return out_image, out_meta
 
     def __del__(self):
         del self
@@ -351,17 +439,11 @@ class Band:
 def _get_x_end_and_y_end(fill_info, actual_shape, virtual_shape):
     data_y_size, data_x_size = actual_shape
 
-    # 如果当前读取到的实际的数据尺寸偏大
-    x_end = int(fill_info[1] - fill_info[0] + 1) if fill_info[1] < data_x_size + fill_info[
-        0] - 1 else data_x_size
-
-    y_end = int(fill_info[3] - fill_info[2] + 1) if fill_info[3] < data_y_size + fill_info[
-        2] - 1 else data_y_size
-
-    if int(fill_info[0] + x_end) > virtual_shape[1]:
-        x_end = int(virtual_shape[1] - fill_info[0])
-    if int(fill_info[2] + y_end) > virtual_shape[0]:
-        y_end = int(virtual_shape[0] - fill_info[2])
+    # 取三个上界的最小值: 填充窗口尺寸 / 实际读到的数据尺寸 / 数组剩余尺寸
+    x_end = min(int(fill_info[1] - fill_info[0] + 1), data_x_size,
+                int(virtual_shape[1] - fill_info[0]))
+    y_end = min(int(fill_info[3] - fill_info[2] + 1), data_y_size,
+                int(virtual_shape[0] - fill_info[2]))
 
     return x_end, y_end
 
@@ -389,13 +471,14 @@ class SlicedBand(Band):
         x, y = tiles
         tile_path = rebuilt_path(f'{fa_directory}/{x}_{y}.tif')
 
-        if self.client.is_accessible(tile_path):
-            access_path = self.client.get_access_path(tile_path)
+        # get_access_path对不存在的对象返回None, 不必先用is_accessible
+        # 多付一次HEAD/stat往返
+        access_path = self.client.get_access_path(tile_path)
+        if access_path is not None:
             data = read_from_access_path(access_path, window=windows, cache=True)
         else:
             # current tile doesn't exist
-            data = np.empty((self.gti.reSize, self.gti.reSize), self.datatype)
-            data.fill(self.nodata)
+            data = np.full((self.gti.reSize, self.gti.reSize), self.nodata, self.datatype)
 
         return data
 
@@ -404,7 +487,8 @@ class SlicedBand(Band):
                     xSize: int,
                     ySize: int,
                     project: str = None,
-                    resample: str = None
+                    resample: str = None,
+                    as_dask: bool = False
                     ):
 
         # 对读取的尺寸存在限制，只能读取最大(0, 4096]大小的数据
@@ -434,54 +518,130 @@ class SlicedBand(Band):
 
         backend_path = self.metadata.backend.path
 
-        # 多线程运行读取数据
-        from concurrent.futures import ThreadPoolExecutor
-
-        repetition_count = 8
+        if as_dask:
+            if list(actual_shape) == list(virtual_shape) and not need_reproject:
+                return self._dask_region(infos, actual_shape, backend_path, zoom)
+            warnings.warn('`as_dask=True` only supports same-CRS reads at the native resolution, '
+                          'falling back to an eager read', stacklevel=2)
 
         base_array = np.empty(actual_shape, self.datatype)
-        base_array.fill(self.nodata)
+        nodata = self.nodata
 
-        def threading_read_from_info(info):
-            tiles, read_info, fill_info = info
-            object_path = rebuilt_path(f'{backend_path}/{tiles[0]}_{tiles[1]}.tif')
+        # 路径拼接是纯CPU工作, 提前在主线程一次做完, worker在持有GIL的
+        # 时间里只剩网络I/O; 签名URL的获取仍留在线程池里并发进行
+        prepared = [(info, rebuilt_path(f'{backend_path}/{info[0][0]}_{info[0][1]}.tif'))
+                    for info in infos]
+
+        def threading_read_from_info(item):
+            (tiles, read_info, fill_info), object_path = item
             data = None
-            if self.client.is_accessible(object_path):
-                url = self.client.get_access_path(object_path)
+            url = self.client.get_access_path(object_path)
+            if url is not None:
                 windows = (read_info[0],
                            read_info[2],
                            int(read_info[1] - read_info[0] + 1),
                            int(read_info[3] - read_info[2] + 1))
                 data = read_from_access_path(url, window=windows, zoom=zoom, cache=True)
 
-            if data is not None:
-                x_end, y_end = _get_x_end_and_y_end(fill_info, data.shape, actual_shape)
-                base_array[fill_info[2]:int(fill_info[2] + y_end), fill_info[0]:int(x_end + fill_info[0])] = data[
-                                                                                                             :y_end,
-                                                                                                             :x_end]
-
-        with ThreadPoolExecutor(repetition_count) as pool:
-            pool.map(threading_read_from_info, infos)
-
-        # for info in infos:
-        #     threading_read_from_info(info)
+            # fill_info矩形两两不相交且铺满整个输出数组, 每个worker只
+            # 写自己的矩形: 有数据填数据, 缺失或未覆盖的边缘补nodata,
+            # 因此读取前不必对整块数组做一次memset
+            y0, x0 = int(fill_info[2]), int(fill_info[0])
+            y1 = min(int(fill_info[3]) + 1, actual_shape[0])
+            x1 = min(int(fill_info[1]) + 1, actual_shape[1])
+            if data is None:
+                base_array[y0:y1, x0:x1] = nodata
+                return
+            x_end, y_end = _get_x_end_and_y_end(fill_info, data.shape, actual_shape)
+            base_array[y0:int(y0 + y_end), x0:int(x0 + x_end)] = data[:y_end, :x_end]
+            if y0 + y_end < y1:
+                base_array[int(y0 + y_end):y1, x0:x1] = nodata
+            if x0 + x_end < x1:
+                base_array[y0:int(y0 + y_end), int(x0 + x_end):x1] = nodata
+
+        # 多线程读取数据, 复用共享线程池, 避免每次read_region都重新起线程;
+        # list() 消费迭代器, 保证worker里的异常在此处抛出
+        list(global_thread_pool_executor.map(threading_read_from_info, prepared))
 
         if list(actual_shape) == list(virtual_shape) and not need_reproject:
             return base_array
-        else:
-            return reproject_by_gdal(
-                base_array,
-                actual_transform,
-                self.crs.ExportToWkt(),
-                self.nodata,
-                actual_shape,
-                transform,
-                project,
-                (ySize, xSize),
-                self.nodata,
-                self.datatype,
-                resample
-            )
+
+        if not need_reproject and resample == 0:
+            # 同坐标系下的纯尺寸调整且为最近邻重采样: 行列索引一次向量化
+            # 映射即可完成, 不必为此搭一整套GDAL warp(VRT/PROJ上下文)
+            step_x, step_y = actual_transform[1], actual_transform[5]
+            src_cols = np.floor((transform[0] - actual_transform[0]) / step_x
+                                + (np.arange(xSize) + 0.5) * (transform[1] / step_x)).astype(np.intp)
+            src_rows = np.floor((transform[3] - actual_transform[3]) / step_y
+                                + (np.arange(ySize) + 0.5) * (transform[5] / step_y)).astype(np.intp)
+            valid_rows = (src_rows >= 0) & (src_rows < actual_shape[0])
+            valid_cols = (src_cols >= 0) & (src_cols < actual_shape[1])
+            if valid_rows.all() and valid_cols.all():
+                return base_array[src_rows[:, None], src_cols]
+            # 请求窗口超出实际数据的部分补nodata
+            result = np.full((ySize, xSize), self.nodata, dtype=self.datatype)
+            result[np.ix_(valid_rows, valid_cols)] = base_array[
+                src_rows[valid_rows][:, None], src_cols[valid_cols]]
+            return result
+
+        return reproject_by_gdal(
+            base_array,
+            actual_transform,
+            self._wkt,
+            self.nodata,
+            actual_shape,
+            transform,
+            project,
+            (ySize, xSize),
+            self.nodata,
+            self.datatype,
+            resample
+        )
+
+    def _dask_region(self, infos, actual_shape, backend_path, zoom):
+        """
+        以tile为分块单位返回惰性的dask数组, 只有被下游实际取用的分块
+        才会触发对应tile的读取。
+        """
+        try:
+            import dask
+            import dask.array as da
+        except ImportError:
+            raise ImportError('`as_dask=True` requires the optional dependency `dask[array]`')
+
+        nodata = self.nodata
+
+        def _read_block(info, block_shape):
+            tiles, read_info, fill_info = info
+            object_path = rebuilt_path(f'{backend_path}/{tiles[0]}_{tiles[1]}.tif')
+            url = self.client.get_access_path(object_path)
+            data = None
+            if url is not None:
+                windows = (read_info[0],
+                           read_info[2],
+                           int(read_info[1] - read_info[0] + 1),
+                           int(read_info[3] - read_info[2] + 1))
+                data = read_from_access_path(url, window=windows, zoom=zoom, cache=True)
+            block = np.full(block_shape, nodata, self.datatype)
+            if data is not None:
+                y_end = min(block_shape[0], data.shape[0])
+                x_end = min(block_shape[1], data.shape[1])
+                block[:y_end, :x_end] = data[:y_end, :x_end]
+            return block
+
+        # fill_info矩形铺满输出数组, 按左上角坐标排成分块网格
+        grid = {}
+        for info in infos:
+            _, _, fill_info = info
+            y0, x0 = int(fill_info[2]), int(fill_info[0])
+            y1 = min(int(fill_info[3]) + 1, actual_shape[0])
+            x1 = min(int(fill_info[1]) + 1, actual_shape[1])
+            block_shape = (y1 - y0, x1 - x0)
+            grid.setdefault(y0, {})[x0] = da.from_delayed(
+                dask.delayed(_read_block)(info, block_shape),
+                shape=block_shape, dtype=self.datatype)
+        return da.block([[row[x0] for x0 in sorted(row)]
+                         for _, row in sorted(grid.items())])
 
     def write_tile(self, x: int, y: int, array, concurrency: bool = False):
 
@@ -505,24 +665,19 @@ class SlicedBand(Band):
         base_directory = base_directory[:-1] if base_directory.endswith('/') else base_directory
 
         with MemoryFile() as mem_file:
-            with mem_file.open(driver='GTiff', count=1, width=shape[1], height=shape[0],
-                               dtype=self.metadata.dtypes[0], nodata=0,
-                               transform=Affine.from_gdal(*transform),
-                               crs=self.get_projection_as_proj4(),
-                               compress='lzw') as dst:
+            with mem_file.open(**self._tile_profile_base, width=shape[1], height=shape[0],
+                               transform=Affine.from_gdal(*transform)) as dst:
                 dst.write(array, 1)
-                print()
-                dst.build_overviews(self.gti._factors, Resampling.nearest)
-                dst.close()
+                if self._overview_factors:
+                    dst.build_overviews(self._overview_factors, Resampling.nearest)
 
-            ctx = mem_file.read()
-            mem_file.close()
-
-        if concurrency:
-            global_thread_pool_executor.upload_tiles(self.client, x, y, ctx, base_directory)
-            return True
-        else:
-            return self.client.upload_by_bytes(f'{x}_{y}.tif', ctx, base_directory)
+            if concurrency:
+                # 异步上传需要持有独立的字节拷贝, /vsimem缓冲在with退出后即释放
+                global_thread_pool_executor.upload_tiles(self.client, x, y, mem_file.read(), base_directory)
+                return True
+            # 同步上传直接引用/vsimem缓冲, 省掉一次整tile的字节拷贝
+            return self.client.upload_by_bytes(f'{x}_{y}.tif', memoryview(mem_file.getbuffer()),
+                                               base_directory)
 
     def write_region(self, transform: [list, tuple], data, concurrency: bool = False):
         if self.metadata.readonly or not self.gti.writeable():
@@ -539,18 +694,16 @@ class SlicedBand(Band):
         if infos is None:
             return False
 
-        suc = True
-        repetition_count = 8
         resample = get_resample_method()
         if list(actual_transform) != list(transform) or list(actual_shape) != list(data_shape):
             base_data = reproject_by_gdal(
                 data,
                 transform,
-                self.crs.ExportToWkt(),
+                self._wkt,
                 self.nodata,
                 data_shape,
                 actual_transform,
-                self.crs.ExportToWkt(),
+                self._wkt,
                 actual_shape,
                 self.nodata,
                 self.datatype,
@@ -559,21 +712,27 @@ class SlicedBand(Band):
         else:
             base_data = data
 
+        tile_size = self.gti.tileSize
+
         def _write_tile(info):
             tile, read_info, fill_info = info
-            array = self.read_tile(*tile)
-            array[read_info[2]:int(read_info[3] + 1), read_info[0]:int(read_info[1] + 1)] = \
-                base_data[fill_info[2]:int(fill_info[3] + 1), fill_info[0]:int(fill_info[1] + 1)]
-            return suc and self.write_tile(tile[0], tile[1], array)
+            if (read_info[0] == 0 and read_info[2] == 0
+                    and int(read_info[1]) == tile_size - 1 and int(read_info[3]) == tile_size - 1):
+                # 写入范围覆盖整块tile, 旧数据会被完全覆盖, 跳过读回
+                array = base_data[fill_info[2]:int(fill_info[3] + 1), fill_info[0]:int(fill_info[1] + 1)]
+            else:
+                array = self.read_tile(*tile)
+                np.copyto(array[read_info[2]:int(read_info[3] + 1), read_info[0]:int(read_info[1] + 1)],
+                          base_data[fill_info[2]:int(fill_info[3] + 1), fill_info[0]:int(fill_info[1] + 1)])
+            return self.write_tile(tile[0], tile[1], array)
 
         if concurrency:
-            with ThreadPoolExecutor(repetition_count) as pool:
-                pool.map(_write_tile, infos)
+            results = list(global_thread_pool_executor.map(_write_tile, infos))
         else:
-            for info in infos:
-                _write_tile(info)
+            results = [_write_tile(info) for info in infos]
 
-        return suc
+        # write_tile同步路径返回(bool, path), 并发路径和守卫分支返回bool
+        return all(r[0] if isinstance(r, tuple) else bool(r) for r in results)
 
 
 class UnSlicedBand(Band):
@@ -616,7 +775,7 @@ class UnSlicedBand(Band):
             xSize = min(xSize, 4096)
             ySize = min(ySize, 4096)
 
-        project = self.crs.ExportToWkt() if project is None else project
+        project = self._wkt if project is None else project
 
         resample = get_resample_method(resample)
 
@@ -628,13 +787,12 @@ class UnSlicedBand(Band):
                                                                                n_shape[0],
                                                                                zoom=zoom)
 
-        base_array = np.empty((ySize, xSize), self.datatype)
-        base_array.fill(self.nodata)
+        base_array = np.full((ySize, xSize), self.nodata, self.datatype)
 
         if read_info is None:
             return base_array
-        if self.client.is_accessible(self.metadata.backend.path):
-            access_path = self.client.get_access_path(self.metadata.backend.path)
+        access_path = self.client.get_access_path(self.metadata.backend.path)
+        if access_path is not None:
             data = read_from_access_path(access_path,
                                          window=(read_info[0],
                                                  read_info[2],
@@ -650,7 +808,7 @@ class UnSlicedBand(Band):
         return base_array if not need_reproject else reproject_by_gdal(
             base_array,
             n_transform,
-            self.crs.ExportToProj4(),
+            self._proj4,
             self.nodata,
             n_shape,
             transform,
@@ -9,13 +9,41 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+from functools import lru_cache
 from typing import Union, Tuple
 
 import math
 
+import numpy as np
+
 from edm_store.dm.vector.core import GeometryGenerator, is_same_crs
 
 
+@lru_cache(maxsize=1024)
+def _compute_pyramid(scala_x, scala_y, tile_size, re_size, range_x, range_y, has):
+    """
+    计算金字塔缩放系数表; 大量数据集共享同一组切分参数, 结果按参数
+    元组缓存, 避免每个GlobalTileInfo实例都重跑一遍循环
+    """
+    x, y = re_size * range_x, re_size * range_y
+    base = max(x, y) / 2
+    _factors = [1]
+    list_x = [scala_x]
+    list_y = [scala_y]
+    sizes = [tile_size]
+    cur = 2
+    if has:
+        # 最小将当前数据缩小到2048
+        while base > 256:
+            _factors.append(cur)
+            sizes.append(int(tile_size / cur))
+            list_x.append(scala_x * cur)
+            list_y.append(scala_y * cur)
+            cur *= 2
+            base = base / 2
+    return tuple(_factors), tuple(list_x), tuple(list_y), tuple(sizes)
+
+
 def _cal_tile_start_index(l_point: Union[int, float],
                           ori_point:  Union[int, float],
                           tile_size: Union[int, float],
@@ -36,17 +64,25 @@ def _cal_tile_start_index(l_point: Union[int, float],
     return tile_start
 
 
+def _ceil_div(x, y):
+    """
+    Ceiling division via the floor-division idiom, equivalent to
+    math.ceil(x / y) for int and float operands without the extra
+    float -> ceil -> int conversion pipeline
+    """
+    return -(-x // y)
+
+
 def _rounding(num, n=0):
     """
-    A new rounding method allows you to set the rounding precision
+    A new rounding method allows you to set the rounding precision.
+    Implemented as pure arithmetic half-up rounding; the window
+    calculation calls this many times per tile, so no string round-trip
     """
-    if '.' in str(num):
-        if len(str(num).split('.')[1]) > n and str(num).split('.')[1][n] == '5':
-            num += 1 * 10 ** -(n + 1)
-    if n:
-        return round(num, n)
-    else:
-        return round(num)
+    if n == 0:
+        return int(num + 0.5) if num >= 0 else -int(-num + 0.5)
+    m = 10 ** n
+    return math.floor(num * m + 0.5) / m
 
 
 def _normalized_read_and_fill_info(read_info, fill_info):
@@ -119,8 +155,8 @@ class GlobalTileInfo:
         self.firstTileLeftY = self.oriY + self.tileYStart * float(tileSize * self.scalaY)
 
         # 计算出当前Tile范围
-        self.rangeX = int(math.ceil((self.rx - self.firstTileLeftX) / float(tileSize * self.scalaX)))
-        self.rangeY = int(math.ceil((self.ry - self.firstTileLeftY) / float(tileSize * self.scalaY)))
+        self.rangeX = int(_ceil_div(self.rx - self.firstTileLeftX, float(tileSize * self.scalaX)))
+        self.rangeY = int(_ceil_div(self.ry - self.firstTileLeftY, float(tileSize * self.scalaY)))
 
         # 获得横向和纵向的切分详情
         self.tileXEnd = self.rangeX - 1
@@ -132,6 +168,10 @@ class GlobalTileInfo:
         self.reSizeYEnd = self.tileYEnd
         self.reSize = self.tileSize
 
+        # get_tiles 的结果由rangeX/rangeY唯一确定, 缓存后重复调用不再
+        # 重新生成; resize 时置空
+        self._tiles_cache = None
+
         # 保存当前数据的金字塔层级数据
         if factors is None:
             self._factors, self.scalaXList, self.scalaYList, self.tileSizeList = self.factors(hasPyramid)
@@ -148,23 +188,11 @@ class GlobalTileInfo:
         scala_y y方向上的分辨率
         tile_size 在不同层级下tile的尺寸
         """
-        x, y = self.reSize * self.rangeX, self.reSize * self.rangeY
-        base = max(x, y) / 2
-        _factors = [1]
-        scala_x = [self.scalaX]
-        scala_y = [self.scalaY]
-        tile_size = [self.tileSize]
-        cur = 2
-        if has:
-            # 最小将当前数据缩小到2048
-            while base > 256:
-                _factors.append(cur)
-                tile_size.append(int(self.tileSize / cur))
-                scala_x.append(self.scalaX * cur)
-                scala_y.append(self.scalaY * cur)
-                cur *= 2
-                base = base / 2
-        return _factors, scala_x, scala_y, tile_size
+        # 缓存内部用tuple保证可哈希, 对外仍按历史行为返回list
+        _factors, list_x, list_y, sizes = _compute_pyramid(
+            self.scalaX, self.scalaY, self.tileSize,
+            self.reSize, self.rangeX, self.rangeY, has)
+        return list(_factors), list(list_x), list(list_y), list(sizes)
 
     def resize(self, tileSize: int):
         """
@@ -181,6 +209,7 @@ class GlobalTileInfo:
         self.reSizeYEnd = (self.tileYEnd + 1) * times - 1
         self.rangeX = int(self.reSizeXEnd + 1)
         self.rangeY = int(self.reSizeYEnd + 1)
+        self._tiles_cache = None
 
     def get_tile_offset(self):
         return self.rangeX, self.rangeY
@@ -205,20 +234,29 @@ class GlobalTileInfo:
         _ny = self.firstTileLeftY + y * self.reSize * self.scalaY
         return (_nx, self.scalaX, 0, _ny, 0, self.scalaY), (self.reSize, self.reSize)
 
+    def get_tiles_array(self) -> np.ndarray:
+        """
+        以(N, 2)的int32数组返回所有tile的(x, y)标号, x优先排列
+        """
+        return np.stack(np.meshgrid(np.arange(self.rangeX, dtype=np.int32),
+                                    np.arange(self.rangeY, dtype=np.int32),
+                                    indexing='ij'), -1).reshape(-1, 2)
+
     def get_tiles(self) -> list:
-        res = []
-        for x in range(0, self.rangeX):
-            for y in range(0, self.rangeY):
-                res.append((x, y))
+        res = self._tiles_cache
+        if res is None:
+            res = self._tiles_cache = [tuple(t) for t in self.get_tiles_array().tolist()]
         return res
 
     def get_all_tile_infos(self) -> list:
-        tiles = self.get_tiles()
-        res = []
-        for tile in tiles:
-            transform, shape = self.get_tile_info(*tile)
-            res.append((tile, transform, shape))
-        return res
+        tiles = self.get_tiles_array()
+        # 所有tile的左上角坐标用一次数组运算算完, 不再逐个调get_tile_info
+        nx = self.firstTileLeftX + tiles[:, 0] * (self.reSize * self.scalaX)
+        ny = self.firstTileLeftY + tiles[:, 1] * (self.reSize * self.scalaY)
+        shape = (self.reSize, self.reSize)
+        return [((x, y), (tx, self.scalaX, 0, ty, 0, self.scalaY), shape)
+                for x, y, tx, ty in zip(tiles[:, 0].tolist(), tiles[:, 1].tolist(),
+                                        nx.tolist(), ny.tolist())]
 
     def get_tile_index_and_offset(self, x, y) -> tuple:
         times = self.tileSize / self.reSize
@@ -273,8 +311,8 @@ class GlobalTileInfo:
         start_index_x = int((read_lx - ori_lx) / (cur_zoom_tile_size * cur_zoom_scala_x))
         start_index_y = int((read_ty - ori_ty) / (cur_zoom_tile_size * cur_zoom_scala_y))
 
-        end_index_x = int(math.ceil((read_rx - ori_lx) / (cur_zoom_tile_size * cur_zoom_scala_x)) - 1)
-        end_index_y = int(math.ceil((read_by - ori_ty) / (cur_zoom_tile_size * cur_zoom_scala_y)) - 1)
+        end_index_x = int(_ceil_div(read_rx - ori_lx, cur_zoom_tile_size * cur_zoom_scala_x) - 1)
+        end_index_y = int(_ceil_div(read_by - ori_ty, cur_zoom_tile_size * cur_zoom_scala_y) - 1)
 
         # 激进的原则，将实际数据包裹进去
 
@@ -283,8 +321,8 @@ class GlobalTileInfo:
         start_offset_y = int(abs((read_ty - self._get_y(start_index_y)) / cur_zoom_scala_y))
 
         # 计算当前读取范围在终止tile中x方向与y方向上的偏移(读取多大的偏移范围) 放大
-        end_offset_x = math.ceil(abs((read_rx - self._get_x(end_index_x)) / cur_zoom_scala_x))
-        end_offset_y = math.ceil(abs((read_by - self._get_y(end_index_y)) / cur_zoom_scala_y))
+        end_offset_x = int(_ceil_div(abs(read_rx - self._get_x(end_index_x)), abs(cur_zoom_scala_x)))
+        end_offset_y = int(_ceil_div(abs(read_by - self._get_y(end_index_y)), abs(cur_zoom_scala_y)))
 
         actual_transform = [self._get_x(start_index_x) + start_offset_x * cur_zoom_scala_x,
                             cur_zoom_scala_x,
@@ -296,49 +334,46 @@ class GlobalTileInfo:
         actual_shape = [(end_index_y - start_index_y ) * cur_zoom_tile_size - start_offset_y + end_offset_y,
                         (end_index_x - start_index_x ) * cur_zoom_tile_size - start_offset_x + end_offset_x]
 
-        # 用于保存需要读取哪些tile，每个tile中的窗口尺寸，填充到实际数据中的窗口尺寸
-        windows_result_list = []
-
-        for x in range(start_index_x, end_index_x + 1):
-            # 初始化每块从0开始读，读取cur_zoom_tile_size长度即读取到 cur_zoom_tile_size - 1
-            read_x0 = 0
-            read_x1 = cur_zoom_tile_size - 1
-
-            # 初始化每读取的块在填入到[fill_x0: fill_x1+1]中
-            fill_x0 = 0 + (x - start_index_x) * cur_zoom_tile_size - start_offset_x
-            fill_x1 = fill_x0 + cur_zoom_tile_size - 1
-
-            if x == start_index_x:
-                # 第一块
-                read_x0 = start_offset_x
-                fill_x0 = 0
-
-            if x == end_index_x:
-                # 最后一块
-                read_x1 = end_offset_x - 1
-                fill_x1 = fill_x0 + read_x1 - read_x0
-
-            for y in range(start_index_y, end_index_y + 1):
-                read_y0 = 0
-                read_y1 = cur_zoom_tile_size - 1
-
-                fill_y0 = 0 + (y - start_index_y) * cur_zoom_tile_size - start_offset_y
-                fill_y1 = fill_y0 + cur_zoom_tile_size - 1
-
-                if y == start_index_y:
-                    read_y0 = start_offset_y
-                    fill_y0 = 0
-
-                if y == end_index_y:
-                    read_y1 = end_offset_y - 1
-                    fill_y1 = fill_y0 + read_y1 - read_y0
-
-                read_info, fill_info = _normalized_read_and_fill_info(
-                    (_rounding(read_x0), _rounding(read_x1), _rounding(read_y0), _rounding(read_y1)),
-                    (_rounding(fill_x0), _rounding(fill_x1), _rounding(fill_y0), _rounding(fill_y1)))
-
-                windows_result_list.append(
-                    ((x, y), read_info, fill_info))
+        nx = end_index_x - start_index_x + 1
+        ny = end_index_y - start_index_y + 1
+
+        if nx <= 0 or ny <= 0:
+            return [], actual_transform, actual_shape
+
+        # 每个tile的读取/填充窗口只由它在对应轴向上的位置决定: 中间块整块
+        # 读, 首尾两块按偏移量裁剪; 先按轴向用数组整体算完再修正首尾,
+        # 避免逐tile的Python双循环. 注意首块的fill终点沿用按偏移算出的
+        # 值, 只把起点归零
+        read_x0 = np.zeros(nx, dtype=np.int64)
+        read_x1 = np.full(nx, cur_zoom_tile_size - 1, dtype=np.int64)
+        fill_x0 = np.arange(nx, dtype=np.int64) * cur_zoom_tile_size - start_offset_x
+        fill_x1 = fill_x0 + cur_zoom_tile_size - 1
+        read_x0[0] = start_offset_x
+        fill_x0[0] = 0
+        read_x1[-1] = end_offset_x - 1
+        fill_x1[-1] = fill_x0[-1] + read_x1[-1] - read_x0[-1]
+
+        read_y0 = np.zeros(ny, dtype=np.int64)
+        read_y1 = np.full(ny, cur_zoom_tile_size - 1, dtype=np.int64)
+        fill_y0 = np.arange(ny, dtype=np.int64) * cur_zoom_tile_size - start_offset_y
+        fill_y1 = fill_y0 + cur_zoom_tile_size - 1
+        read_y0[0] = start_offset_y
+        fill_y0[0] = 0
+        read_y1[-1] = end_offset_y - 1
+        fill_y1[-1] = fill_y0[-1] + read_y1[-1] - read_y0[-1]
+
+        # 与原先的双循环保持一致的顺序(x优先), x方向的窗口按ny重复,
+        # y方向的窗口按nx平铺, 一次zip生成结果
+        windows_result_list = [
+            ((x, y), *_normalized_read_and_fill_info((rx0, rx1, ry0, ry1),
+                                                     (fx0, fx1, fy0, fy1)))
+            for x, y, rx0, rx1, ry0, ry1, fx0, fx1, fy0, fy1 in zip(
+                np.repeat(np.arange(start_index_x, end_index_x + 1), ny).tolist(),
+                np.tile(np.arange(start_index_y, end_index_y + 1), nx).tolist(),
+                np.repeat(read_x0, ny).tolist(), np.repeat(read_x1, ny).tolist(),
+                np.tile(read_y0, nx).tolist(), np.tile(read_y1, nx).tolist(),
+                np.repeat(fill_x0, ny).tolist(), np.repeat(fill_x1, ny).tolist(),
+                np.tile(fill_y0, nx).tolist(), np.tile(fill_y1, nx).tolist())]
 
         return windows_result_list, actual_transform, actual_shape
 
@@ -398,12 +433,12 @@ class GlobalTileInfo:
         if max_x >= self.rx:
             max_x = self.rx
         else:
-            max_x = math.ceil((max_x - self.lx) / self.scalaXList[zoom]) * self.scalaXList[zoom] + self.lx
+            max_x = _ceil_div(max_x - self.lx, self.scalaXList[zoom]) * self.scalaXList[zoom] + self.lx
 
         if min_y <= self.ry:
             min_y = self.ry
         else:
-            min_y = math.ceil((min_y - self.ly)/ self.scalaYList[zoom]) * self.scalaYList[zoom] + self.ly
+            min_y = _ceil_div(min_y - self.ly, self.scalaYList[zoom]) * self.scalaYList[zoom] + self.ly
 
         # min_y = max(min_y, self.ry)
         # max_x = min(max_x, self.rx)
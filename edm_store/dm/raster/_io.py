@@ -9,6 +9,7 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import os
 import threading
 from concurrent.futures import ThreadPoolExecutor
 from typing import Union, Tuple, List
@@ -24,6 +25,20 @@ from edm_store.storage import AbsBackendClient
 from edm_store.utils.cache import global_cache
 from edm_store.utils.pixel_type import global_data_type
 
+# 典型负载是对同一批远端GeoTIFF做大量小窗口随机读, GDAL的块缓存和
+# VSI/HTTP缓存直接决定重复访问是否回源; 只在调用方没有通过环境变量
+# 或GDAL配置显式指定时才设置默认值
+_GDAL_IO_DEFAULTS = {
+    'GDAL_CACHEMAX': '512',
+    'VSI_CACHE': 'TRUE',
+    'VSI_CACHE_SIZE': '268435456',
+    'CPL_VSIL_CURL_CACHE_SIZE': '268435456',
+    'GDAL_DISABLE_READDIR_ON_OPEN': 'EMPTY_DIR',
+}
+for _key, _value in _GDAL_IO_DEFAULTS.items():
+    if _key not in os.environ and gdal.GetConfigOption(_key) is None:
+        gdal.SetConfigOption(_key, _value)
+
 
 def read_from_access_path(access_path: str,
                           window: Union[Tuple, List] = None,
@@ -44,10 +59,20 @@ def read_from_access_path(access_path: str,
         return numpy.zeros((window[3], window[2]), dtype=numpy.int16)
 
     if cache:
+        # 同一(路径, 窗口, 层级)的重复读直接命中解码结果, 不再每次从
+        # 缓存字节里重新解析GeoTIFF头并解压; 存取都拷贝一份, 避免调用
+        # 方改写返回数组时污染缓存
+        decoded_key = (access_path, tuple(window) if window is not None else None, zoom)
+        decoded = global_cache.get(decoded_key)
+        if decoded is not None:
+            return decoded.copy()
+
         if global_cache.has(access_path):
-            return _from_memory(global_cache.get(access_path), window=window, zoom=zoom)
+            data = _from_memory(global_cache.get(access_path), window=window, zoom=zoom)
         else:
-            return _from_access_path(access_path, window=window, zoom=zoom)
+            data = _from_access_path(access_path, window=window, zoom=zoom)
+        global_cache.set(decoded_key, data.copy(), 3600)
+        return data
 
     else:
         if zoom is not None and zoom != 0:
@@ -143,17 +168,35 @@ def _from_access_path(access_path, window=None, zoom=None):
     return data
 
 
+# 复用TCP连接, 避免每次预取tile都重新握手
+_HTTP_SESSION = requests.Session()
+_HTTP_SESSION.mount('http://', requests.adapters.HTTPAdapter(pool_maxsize=32))
+_HTTP_SESSION.mount('https://', requests.adapters.HTTPAdapter(pool_maxsize=32))
+
+# 正在预取中的路径集合, 同一tile的并发读只触发一次下载
+_INFLIGHT = set()
+_INFLIGHT_LOCK = threading.Lock()
+
+
 def _cache_tile(target_path: str):
-    if target_path.startswith('http'):
-        response = requests.get(target_path)
-        if response.status_code == 200:
-            global_cache.set(target_path, response.content, 3600)
-    elif target_path.startswith('/') or target_path.startswith('.'):
-        with open(target_path, 'rb') as file:
-            ctx = file.read()
-        global_cache.set(target_path, ctx, 3600)
-    else:
-        return None
+    with _INFLIGHT_LOCK:
+        if target_path in _INFLIGHT:
+            return None
+        _INFLIGHT.add(target_path)
+    try:
+        if target_path.startswith('http'):
+            response = _HTTP_SESSION.get(target_path)
+            if response.status_code == 200:
+                global_cache.set(target_path, response.content, 3600)
+        elif target_path.startswith('/') or target_path.startswith('.'):
+            with open(target_path, 'rb') as file:
+                ctx = file.read()
+            global_cache.set(target_path, ctx, 3600)
+        else:
+            return None
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.discard(target_path)
 
 
 def _upload_tile(client: AbsBackendClient, x, y, ctx, fa_directory):
@@ -165,23 +208,29 @@ def _delete_tiles(client: AbsBackendClient, x, y, fa_directory):
 
 
 class LocalThreadPoolExecutor:
-    __THREAD_POOL_EXECUTOR = ThreadPoolExecutor(max_workers=8)
+    # 共享线程池, 读写删除tile都走这里, 线程数可用EDM_IO_WORKERS覆盖
+    __THREAD_POOL_EXECUTOR = ThreadPoolExecutor(
+        max_workers=int(os.environ.get('EDM_IO_WORKERS', 8)))
 
     def delete_tiles(self, client: AbsBackendClient, x, y, fa_directory):
-        self.__THREAD_POOL_EXECUTOR.submit(_delete_tiles, (client, x, y, fa_directory,))
+        self.__THREAD_POOL_EXECUTOR.submit(_delete_tiles, client, x, y, fa_directory)
 
     def upload_tiles(self, client: AbsBackendClient, x, y, ctx, fa_directory):
-        self.__THREAD_POOL_EXECUTOR.submit(_upload_tile, (client, x, y, ctx, fa_directory,))
+        self.__THREAD_POOL_EXECUTOR.submit(_upload_tile, client, x, y, ctx, fa_directory)
 
     def cache_tiles(self, target_path):
-        daemon_thread = threading.Thread(target=_cache_tile, args=(target_path,), daemon=True)
-        daemon_thread.start()
+        # 走共享线程池而不是每次新建daemon线程; 已缓存或正在下载的路径
+        # 在_cache_tile内部直接跳过
+        if global_cache.has(target_path):
+            return
+        self.__THREAD_POOL_EXECUTOR.submit(_cache_tile, target_path)
 
     def map(self, func, iterables, timeout=None, chunksize=1):
-        self.__THREAD_POOL_EXECUTOR.map(func, iterables, timeout=timeout, chunksize=chunksize)
+        return self.__THREAD_POOL_EXECUTOR.map(func, iterables, timeout=timeout, chunksize=chunksize)
 
     def close(self):
-        self.__THREAD_POOL_EXECUTOR = None
+        # 线程池是所有Band共享的, 不能简单置None让其他使用者拿到空引用
+        self.__THREAD_POOL_EXECUTOR.shutdown(wait=False)
 
 
 global_thread_pool_executor = LocalThreadPoolExecutor()
@@ -13,31 +13,46 @@ from typing import Union
 
 import numpy as np
 
-from osgeo import ogr, osr
+from osgeo import gdal, osr
 from edm_store.dm.raster import Band, RasterIoBand
 from edm_store.dm.vector.core import is_same_crs
 
 __EQUAL_AREA_PROJECTION = '+proj=aea +lat_1=15 +lat_2=65 +lat_0=30 +lon_0=95 +x_0=0 +y_0=0 +datum=WGS84 +units=m +no_defs'
 
+_EARTH_RADIUS = 6378137.0
+
+
+def _build_spatial_reference(user_input: str) -> osr.SpatialReference:
+    srs = osr.SpatialReference()
+    srs.SetFromUserInput(user_input)
+    if str(gdal.__version__) >= '3.0.0':
+        from osgeo.osr import OAMS_TRADITIONAL_GIS_ORDER
+
+        srs.SetAxisMappingStrategy(OAMS_TRADITIONAL_GIS_ORDER)
+    return srs
+
 
 def _get_pixel_area(geoTransform: tuple,
                     shape,
                     project='EPSG:4326',
                     equalAreaProjection=None):
     ySize, xSize = shape
-    _projection = osr.SpatialReference()
-    _projection.SetFromUserInput(project)
 
     if equalAreaProjection is None:
         equalAreaProjection = __EQUAL_AREA_PROJECTION
 
-    _equalAreaProjection = osr.SpatialReference()
-    _equalAreaProjection.SetFromUserInput(equalAreaProjection)
+    # EPSG:4326配默认等积投影时直接用球面纬度带公式闭式求解, 整个过程
+    # 不触碰OGR: A = R^2 * Δλ * |sinφ_top - sinφ_bot|
+    if equalAreaProjection == __EQUAL_AREA_PROJECTION and is_same_crs(project, 'EPSG:4326'):
+        lat_top = np.deg2rad(geoTransform[3] + np.arange(ySize, dtype=np.float64) * geoTransform[5])
+        lat_bot = lat_top + np.deg2rad(geoTransform[5])
+        dlon = np.deg2rad(abs(geoTransform[1]))
+        col = (_EARTH_RADIUS ** 2) * dlon * np.abs(np.sin(lat_top) - np.sin(lat_bot))
+        return np.broadcast_to(col[:, None], (ySize, xSize))
 
-    # 创建一个空的ogr多边形对象 创建多多边形
-    grid_geom = ogr.CreateGeometryFromJson('{"type": "MultiPolygon", "coordinates": []}')
-    # 为多边形指定投影
-    grid_geom.AssignSpatialReference(_projection)
+    _projection = _build_spatial_reference(project)
+
+    _equalAreaProjection = _build_spatial_reference(equalAreaProjection)
 
     # 柱形投影而言，维度相同的像素面积必然相同，因此只需要算一列即可
     if is_same_crs(project, 'EPSG:4326') or is_same_crs(project, 'EPSG:3857') \
@@ -46,24 +61,23 @@ def _get_pixel_area(geoTransform: tuple,
     else:
         xSize_ = xSize
 
-    for y in range(ySize):
-        t = geoTransform[3] + y * geoTransform[5]
-        b = t + geoTransform[5]
-        for x in range(xSize_):
-            l = geoTransform[0] + x * geoTransform[1]
-            r = l + geoTransform[1]
-            co = [[[l, b], [l, t], [r, t], [r, b], [l, b]]]
-            geojson = '{"type": "Polygon", "coordinates": %s}' % co
-            grid_geom.AddGeometry(ogr.CreateGeometryFromJson(geojson))
-
-    # 将新创建的ogr多边形转换到等面积投影上
-    suc = grid_geom.TransformTo(_equalAreaProjection)
-    if ogr.OGRERR_NONE != suc:
-        raise TypeError("Transform Fail")
-    # 计算每个像素的面积并生成列表
-    pixelArea_flat = [grid_geom.GetGeometryRef(i).GetArea() for i in range(grid_geom.GetGeometryCount())]
-    # 把像素面积列表转化为长宽合适的numpy矩阵
-    pixelArea = np.array(pixelArea_flat).reshape(ySize, xSize_)
+    # 所有像素角点只算一次: 相邻像素共享角点, 一次批量投影转换代替
+    # 逐像素构造OGR多边形再整体TransformTo
+    xs = geoTransform[0] + np.arange(xSize_ + 1, dtype=np.float64) * geoTransform[1]
+    ys = geoTransform[3] + np.arange(ySize + 1, dtype=np.float64) * geoTransform[5]
+    xx, yy = np.meshgrid(xs, ys)
+
+    transformation = osr.CoordinateTransformation(_projection, _equalAreaProjection)
+    points = np.asarray(transformation.TransformPoints(
+        list(zip(xx.ravel().tolist(), yy.ravel().tolist()))))
+    X = points[:, 0].reshape(ySize + 1, xSize_ + 1)
+    Y = points[:, 1].reshape(ySize + 1, xSize_ + 1)
+
+    # 投影后的像素四边形用对角线叉积(鞋带公式)直接算面积
+    pixelArea = 0.5 * np.abs(
+        (X[:-1, 1:] - X[1:, :-1]) * (Y[:-1, :-1] - Y[1:, 1:])
+        - (X[:-1, :-1] - X[1:, 1:]) * (Y[:-1, 1:] - Y[1:, :-1]))
+
     if xSize_ != xSize:
         pixelArea = np.broadcast_to(pixelArea, (ySize, xSize))
     return pixelArea
@@ -160,8 +160,7 @@ class RasterIoBand:
             if read_info is None:
                 continue
 
-            base_array = np.empty(newTile[0], self.datatype(band))
-            base_array.fill(self.get_nodata_value(band))
+            base_array = np.full(newTile[0], self.get_nodata_value(band), self.datatype(band))
 
             window = (
                 read_info[0], read_info[2], int(read_info[1] - read_info[0] + 1), int(read_info[3] - read_info[2] + 1))
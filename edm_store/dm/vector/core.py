@@ -10,6 +10,7 @@
 # See the Mulan PSL v2 for more details.
 
 import json as _json
+from functools import lru_cache
 
 from osgeo import ogr as _ogr, osr, gdal
 from typing import Union, Optional
@@ -133,17 +134,11 @@ def gen_geobox(
     return gg
 
 
-def geobox_info(transform: Union[tuple, list], shape: Union[tuple, list],
-                s_crs: Optional[str] = None, t_crs: Optional[str] = None) -> str:
-    """
-    生成一个矩形，并以Geojson格式输出，如果需要输出该矩形在其他坐标系的矩形则需要输入sCRS与tCRS
-
-    :param transform [tuple, list] Gdal格式的矩阵 （x，scala_x，0,y,0, scala_y)
-    :param shape [tuple, list] 矩阵的形状 （height， wight）
-    :param s_crs str 源坐标系
-    :param t_crs str 目标坐标系
-
-    """
+@lru_cache(maxsize=4096)
+def _geobox_geojson(transform: tuple, shape: tuple,
+                    s_crs: Optional[str], t_crs: Optional[str]) -> str:
+    # 同一目录批量入库时大量波段共享同一 (transform, shape, crs), 缓存
+    # geojson字符串即可跳过osr坐标系初始化与几何转换
     min_x, step_x, _, max_y, _, step_y = transform
     max_x = min_x + shape[1] * step_x
     min_y = max_y + shape[0] * step_y
@@ -154,10 +149,32 @@ def geobox_info(transform: Union[tuple, list], shape: Union[tuple, list],
                             ]
                             }, s_crs)
     if not t_crs:
-        return _json.loads(gg.export_to_geojson())
+        return gg.export_to_geojson()
     if not s_crs:
         raise ValueError(f"sCrs is None!\nIf you want get geobox in Crs:{t_crs}, sCrs can't be None")
-    return _json.loads(gg.transform(t_crs).export_to_geojson())
+    return gg.transform(t_crs).export_to_geojson()
+
+
+def geobox_info(transform: Union[tuple, list], shape: Union[tuple, list],
+                s_crs: Optional[str] = None, t_crs: Optional[str] = None) -> dict:
+    """
+    生成一个矩形，并以Geojson格式输出，如果需要输出该矩形在其他坐标系的矩形则需要输入sCRS与tCRS
+
+    :param transform [tuple, list] Gdal格式的矩阵 （x，scala_x，0,y,0, scala_y)
+    :param shape [tuple, list] 矩阵的形状 （height， wight）
+    :param s_crs str 源坐标系
+    :param t_crs str 目标坐标系
+
+    """
+    # 每次调用重新loads, 调用方拿到的是独立可变的dict
+    return _json.loads(_geobox_geojson(tuple(transform), tuple(shape), s_crs, t_crs))
+
+
+def invalidate_geobox_cache() -> None:
+    """
+    清空 `geobox_info` 的结果缓存。
+    """
+    _geobox_geojson.cache_clear()
 
 
 def is_same_crs(s_crs, t_crs):
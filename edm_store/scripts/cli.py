@@ -128,7 +128,7 @@ def add(image_name, dataset, storage_type, prefix, shard, directory, files, tile
 
         client = storage_client_mapper.get(storage_type)
 
-        mongodb = get_metadata_resource_instance(config.db_config)
+        mongodb = get_metadata_resource_instance(config.db_config, config.datasource)
 
         if dataset is None or dataset == '' or dataset not in config.datasource_config.keys():
             click.echo('No such dataset: {}'.format(dataset))
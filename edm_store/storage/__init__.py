@@ -9,6 +9,8 @@
 # MERCHANTABILITY OR FIT FOR A PARTICULAR PURPOSE.
 # See the Mulan PSL v2 for more details.
 
+import threading
+
 from edm_store.config import get_config
 from edm_store.storage.AbsClient import AbsBackendClient
 from edm_store.storage.fs import FSClient
@@ -32,15 +34,21 @@ _CLIENT_CONSTRUCTORS = {
 
 class ClientGenerator:
     CACHE_STORE = {}
+    _CACHE_LOCK = threading.Lock()
 
     def storeClient(self, storeType: str) -> AbsBackendClient:
+        # 命中缓存时不加锁; 未命中时加锁二次检查, 避免线程池里的多个
+        # worker并发为同一后端各建一个client(及其连接)
         client = self.CACHE_STORE.get(storeType)
         if client is None:
-            _CLIENT_CONSTRUCTORS_CONFIG_ITEMS = get_config().storage_config
-            constructor = _CLIENT_CONSTRUCTORS[_CLIENT_CONSTRUCTORS_CONFIG_ITEMS[storeType]["type"]]
-            parameters = _CLIENT_CONSTRUCTORS_CONFIG_ITEMS[storeType]['configure_params']
-            self.CACHE_STORE[storeType] = constructor(parameters)
-        return self.CACHE_STORE[storeType]
+            with self._CACHE_LOCK:
+                client = self.CACHE_STORE.get(storeType)
+                if client is None:
+                    _CLIENT_CONSTRUCTORS_CONFIG_ITEMS = get_config().storage_config
+                    constructor = _CLIENT_CONSTRUCTORS[_CLIENT_CONSTRUCTORS_CONFIG_ITEMS[storeType]["type"]]
+                    parameters = _CLIENT_CONSTRUCTORS_CONFIG_ITEMS[storeType]['configure_params']
+                    client = self.CACHE_STORE[storeType] = constructor(parameters)
+        return client
 
     def __getattr__(self, storeType: str):
         return self.storeClient(storeType)
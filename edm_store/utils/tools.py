@@ -14,10 +14,11 @@ import re
 import string
 
 from datetime import datetime
+from functools import lru_cache
 import random
 from typing import Tuple, Optional
 
-from edm_store.config import get_config
+from edm_store.config import get_config, register_config_invalidation_hook
 
 
 # -------------------------------时间处理函数--------------------------------
@@ -72,7 +73,8 @@ def gen_format_time(timeStr: Optional[str] = None) -> Tuple[int, int]:
 
 # -------------------------------路径处理函数--------------------------------
 
-# 用于生成统一格式的路径
+# 用于生成统一格式的路径; 批量导入时同一路径会被反复校验, 结果可直接复用
+@lru_cache(maxsize=4096)
 def verify_and_rebuild_path(path_str: str) -> str:
     path_str = rebuilt_path(path_str)
 
@@ -103,6 +105,10 @@ def verify_and_rebuild_path(path_str: str) -> str:
     return path_str
 
 
+# 校验结果依赖create_allowed, 配置切换时随init_config一起失效
+register_config_invalidation_hook(verify_and_rebuild_path.cache_clear)
+
+
 def rebuilt_path(pathStr: str, sep: Optional[str] = "/") -> str:
     pathStr = os.path.normpath(pathStr)
     if '\\' in pathStr:
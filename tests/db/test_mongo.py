@@ -60,7 +60,8 @@ def test_step0_find():
 
 @pytest.mark.dependency(depends=["test_step0_find"])
 def test_step1_update():
-    MONGO_RESOURCE.update(COLLECTION, {"name": "bob"}, {"$set": {"extra2": "yeah"}})
+    # `update` wraps the fields in {"$set": ...} itself
+    MONGO_RESOURCE.update(COLLECTION, {"name": "bob"}, {"extra2": "yeah"})
 
     res = list(MONGO_RESOURCE.find(COLLECTION, {}))
     for x in res:
@@ -8,6 +8,7 @@ from edm_store.dm.meta._api_impl import (
     load_dataset_from_file,
     get_image,
     get_band,
+    _tile_paths,
 )
 
 from edm_store import config
@@ -89,3 +90,14 @@ def test_image_api():
 
     # will delete band
     assert exist(_band_name1) == False
+
+
+def test_tile_paths():
+    assert _tile_paths("/edm_store/test/band_dir", []) == []
+
+    paths = _tile_paths("/edm_store/test/band_dir", [(0, 0), (1, 2), (10, 20)])
+    assert paths == [
+        "/edm_store/test/band_dir/0_0.tif",
+        "/edm_store/test/band_dir/1_2.tif",
+        "/edm_store/test/band_dir/10_20.tif",
+    ]
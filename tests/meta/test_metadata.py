@@ -0,0 +1,56 @@
+import pytest
+
+from edm_store.dm.metadata import Metadata, freeze
+
+_doc = {
+    "band_path": "/edm_store/test/a.BAND",
+    "nodata": 0,
+    "backend": {"path": "/opt/test/data/a", "type": "fs"},
+}
+
+
+def test_freeze():
+    record = freeze(_doc)
+
+    assert record.band_path == _doc["band_path"]
+    assert record.nodata == 0
+    # 嵌套dict递归冻结
+    assert record.backend.path == "/opt/test/data/a"
+    assert record.backend.type == "fs"
+
+
+def test_freeze_is_immutable():
+    record = freeze(_doc)
+
+    with pytest.raises(AttributeError):
+        record.nodata = 1
+    # 与Metadata不同, 不存在的字段直接抛AttributeError
+    with pytest.raises(AttributeError):
+        _ = record.no_such_field
+
+
+def test_freeze_shares_record_type():
+    # 键集合相同的文档复用同一个record类
+    other = {"band_path": "/edm_store/test/b.BAND", "nodata": 255,
+             "backend": {"path": "/opt/test/data/b", "type": "fs"}}
+    assert type(freeze(_doc)) is type(freeze(other))
+
+
+def test_metadata_nested_access():
+    meta = Metadata(_doc)
+
+    assert meta.band_path == _doc["band_path"]
+    assert meta.backend.path == "/opt/test/data/a"
+    # 不存在的字段返回None而不是抛异常
+    assert meta.no_such_field is None
+
+
+def test_metadata_flatten():
+    meta = Metadata(_doc, flatten=True)
+
+    # 嵌套dict折叠成下划线连接的顶层键
+    assert meta.backend_path == "/opt/test/data/a"
+    assert meta.backend_type == "fs"
+    assert meta.band_path == _doc["band_path"]
+    # 折叠后原来的嵌套键不复存在
+    assert meta.backend is None
@@ -0,0 +1,83 @@
+import numpy as np
+
+# noinspection PyProtectedMember
+from edm_store.dm.meta._model import BandMetadata, BandTable
+
+_transform = [12834619, 30, 0, 5011732, 0, -30]
+_shape = (2000, 2000)
+_proj = "EPSG:3857"
+
+# 2000 * 30 = 60000, 留出40000的间隔保证包围盒互不相交
+_band_stride = 100000
+
+
+def _make_band(idx: int) -> BandMetadata:
+    return BandMetadata(
+        _proj,
+        _shape,
+        [_transform[0] + idx * _band_stride, 30, 0, _transform[3], 0, -30],
+        f"/edm_store/test/band_{idx}.BAND",
+        f"/edm_store/test/band_{idx}",
+        0,
+        1,
+        "int16",
+        storeType="fs",
+    )
+
+
+def test_band_metadata_export():
+    band = _make_band(0)
+    doc = band.export_to_dict()
+
+    assert doc["band_path"] == "/edm_store/test/band_0.BAND"
+    assert doc["band_name"] == "band_0.BAND"
+    assert doc["shape"] == _shape
+    assert doc["nodata"] == (0,)
+    assert doc["dtypes"] == ("int16",)
+    assert doc["backend"]["path"] == "/edm_store/test/band_0"
+    assert doc["backend"]["type"] == "fs"
+    # pymongo往插入文档里写'_id', 导出必须是新建的可变dict
+    doc["_id"] = "whatever"
+    assert "_id" not in band.export_to_dict()
+
+
+def test_as_numpy_extent():
+    band = _make_band(0)
+    xmin, ymin, xmax, ymax = band.as_numpy_extent()
+
+    assert xmin == _transform[0]
+    assert xmax == _transform[0] + _shape[1] * _transform[1]
+    assert ymax == _transform[3]
+    assert ymin == _transform[3] + _shape[0] * _transform[-1]
+
+
+def test_band_table():
+    bands = [_make_band(i) for i in range(4)]
+    table = BandTable.from_band_metadata(bands)
+
+    assert len(table) == 4
+    assert table.band_paths == [b.band_path for b in bands]
+    assert table.shapes.shape == (4, 2)
+    assert np.all(table.shapes == np.asarray(_shape))
+    assert table.transforms.shape == (4, 6)
+    assert table.extents.shape == (4, 4)
+
+    # 查询覆盖第0和第1块范围的包围盒, 只命中这两块
+    bbox = [_transform[0], _transform[3] - 60000,
+            _transform[0] + _band_stride + 1, _transform[3]]
+    mask = table.overlaps(bbox)
+    assert mask.dtype == np.bool_
+    assert mask.tolist() == [True, True, False, False]
+
+    # 与所有块都不相交的包围盒
+    far = [_transform[0] - 2000, _transform[3] + 1000,
+           _transform[0] - 1000, _transform[3] + 2000]
+    assert table.overlaps(far).tolist() == [False, False, False, False]
+
+
+def test_band_table_empty():
+    table = BandTable.from_band_metadata([])
+
+    assert len(table) == 0
+    assert table.extents.shape == (0, 4)
+    assert table.overlaps([0, 0, 1, 1]).tolist() == []
@@ -1,3 +1,5 @@
+import numpy as np
+
 from edm_store.dm.raster import GlobalTileInfo
 from edm_store.dm.vector.core import gen_geobox
 
@@ -181,6 +183,35 @@ def test_calculate_read_window_of_sliced_band():
     assert list(window_infos[0][2]) == [0, 49, 0, 79]
 
 
+def test_calculate_read_window_of_sliced_band_multi_tile():
+    tile_size = 2048
+    gti = GlobalTileInfo(_transform, 9000, 9000, tile_size)
+
+    # 读取起点偏离tile边界100个像素, 范围横跨x方向2块、y方向2块
+    t, _ = gti.get_tile_info(0, 0)
+    transform = [t[0] + 100 * t[1], t[1], 0, t[3] + 100 * t[5], 0, t[5]]
+    x_size, y_size = 3000, 2500
+
+    window_infos, actual_transform, actual_shape = \
+        gti.calculate_read_window_of_sliced_band(transform, x_size, y_size)
+
+    assert list(actual_shape) == [y_size, x_size]
+    assert list(actual_transform) == list(transform)
+
+    # tile编号按x优先的顺序给出
+    assert [list(tile) for tile, _, _ in window_infos] == [[0, 0], [0, 1], [1, 0], [1, 1]]
+
+    cover = np.zeros((y_size, x_size), dtype=np.int32)
+    for _, read_info, fill_info in window_infos:
+        # 规整后读取窗口与填充窗口在每个轴向上等长
+        assert read_info[1] - read_info[0] == fill_info[1] - fill_info[0]
+        assert read_info[3] - read_info[2] == fill_info[3] - fill_info[2]
+        cover[fill_info[2]:int(fill_info[3]) + 1, fill_info[0]:int(fill_info[1]) + 1] += 1
+
+    # 填充窗口两两不相交且恰好铺满整个输出数组
+    assert cover.min() == 1 and cover.max() == 1
+
+
 def test_calculate_read_window_of_unsliced_band():
     tile_size = 2048
     gti = GlobalTileInfo(_transform, 9000, 9000, tile_size)
@@ -0,0 +1,21 @@
+import math
+
+import numpy as np
+
+# noinspection PyProtectedMember
+from edm_store.dm.raster._pixel_area_band import _get_pixel_area, _EARTH_RADIUS
+
+
+def test_spherical_pixel_area():
+    # 1°x1°的全球格网, EPSG:4326配默认等积投影走球面纬度带闭式解
+    transform = (-180, 1, 0, 90, 0, -1)
+    areas = _get_pixel_area(transform, [180, 360], 'EPSG:4326')
+
+    assert areas.shape == (180, 360)
+    assert np.all(areas > 0)
+    # 同一纬度带内面积处处相同
+    assert np.allclose(areas, areas[:, :1])
+    # 南北半球对称
+    assert np.allclose(areas, areas[::-1])
+    # 所有像素面积之和为球面总面积 4*pi*R^2
+    assert math.isclose(areas.sum(), 4 * math.pi * _EARTH_RADIUS ** 2, rel_tol=1e-9)